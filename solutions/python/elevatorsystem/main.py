@@ -5,91 +5,347 @@ class Direction(Enum):
     UP = 1
     DOWN = 2
 
+# dispatch_policy.py
+from abc import ABC, abstractmethod
+
+class DispatchPolicy(ABC):
+    @abstractmethod
+    def select(self, elevators, source_floor, destination_floor):
+        pass
+
 # elevator.py
 import time
 from threading import Lock, Condition
 from request import Request
 from direction import Direction
+from look_scheduler import LookScheduler
+from request_scheduler import RequestScheduler
 
 class Elevator:
-    def __init__(self, id: int, capacity: int):
+    FLOOR_TRAVEL_TIME = 1
+
+    def __init__(self, id: int, capacity: int, verbose: bool = True, scheduler: RequestScheduler = None):
         self.id = id
         self.capacity = capacity
+        self.verbose = verbose
         self.current_floor = 1
         self.current_direction = Direction.UP
-        self.requests = []
+        self.scheduler = scheduler or LookScheduler()
         self.lock = Lock()
         self.condition = Condition(self.lock)
 
-    def add_request(self, request: Request):
+    def add_request(self, request: Request) -> bool:
         with self.lock:
-            if len(self.requests) < self.capacity:
-                self.requests.append(request)
+            if self.scheduler.size() >= self.capacity:
+                return False
+            self.scheduler.add(request)
+            if self.verbose:
                 print(f"Elevator {self.id} added request: {request.source_floor} to {request.destination_floor}")
-                self.condition.notify_all()
+            self.condition.notify_all()
+            return True
+
+    def next_stop(self):
+        with self.lock:
+            return self._next_stop()
+
+    def get_state(self):
+        # One consistent snapshot for dispatch: (floor, direction, pending requests, lowest stop, highest stop)
+        with self.lock:
+            lowest, highest = self.scheduler.stop_range()
+            return self.current_floor, self.current_direction, self.scheduler.size(), lowest, highest
+
+    def move_to(self, floor: int):
+        with self.lock:
+            if floor != self.current_floor:
+                self.current_direction = Direction.UP if floor > self.current_floor else Direction.DOWN
+            self.current_floor = floor
+        if self.verbose:
+            print(f"Elevator {self.id} reached floor {floor}")
 
-    def get_next_request(self) -> Request:
+    def open_doors(self, now=None) -> list:
         with self.lock:
-            while not self.requests:
-                self.condition.wait()
-            return self.requests.pop(0)
+            completed, self.current_direction = self.scheduler.serve(self.current_floor, self.current_direction, now)
+            return completed
 
     def process_requests(self):
         while True:
             with self.lock:
-                while self.requests:
-                    request = self.get_next_request()
-                    self.process_request(request)
-                self.condition.wait()
-
-    def process_request(self, request: Request):
-        start_floor = self.current_floor
-        end_floor = request.destination_floor
-
-        if start_floor < end_floor:
-            self.current_direction = Direction.UP
-            for i in range(start_floor, end_floor + 1):
-                self.current_floor = i
-                print(f"Elevator {self.id} reached floor {self.current_floor}")
-                time.sleep(1)  # Simulating elevator movement
-        elif start_floor > end_floor:
-            self.current_direction = Direction.DOWN
-            for i in range(start_floor, end_floor - 1, -1):
-                self.current_floor = i
-                print(f"Elevator {self.id} reached floor {self.current_floor}")
-                time.sleep(1)  # Simulating elevator movement
+                while self._next_stop() is None:
+                    self.condition.wait()
+                target = self._next_stop()
+            # The lock is released while moving so requests can be added to a travelling car
+            if target == self.current_floor:
+                self.open_doors(time.monotonic())
+                continue
+            time.sleep(self.FLOOR_TRAVEL_TIME)  # Simulating elevator movement
+            self.move_to(self.current_floor + (1 if target > self.current_floor else -1))
 
     def run(self):
         self.process_requests()
 
+    def _next_stop(self):
+        stop, self.current_direction = self.scheduler.next_stop(self.current_floor, self.current_direction)
+        return stop
+
 # elevator_controller.py
+import time
 from threading import Thread
 from elevator import Elevator
+from eta_dispatch_policy import EtaDispatchPolicy
+from look_scheduler import LookScheduler
 from request import Request
 
 class ElevatorController:
-    def __init__(self, num_elevators: int, capacity: int):
+    def __init__(self, num_elevators: int, capacity: int, start_threads: bool = True, verbose: bool = True,
+                 scheduler=LookScheduler, dispatch_policy=None):
         self.elevators = []
+        self.dispatch_policy = dispatch_policy or EtaDispatchPolicy()
+        self.dispatch_count = 0
+        self.dispatch_time = 0.0
         for i in range(num_elevators):
-            elevator = Elevator(i + 1, capacity)
+            elevator = Elevator(i + 1, capacity, verbose, scheduler())
             self.elevators.append(elevator)
-            Thread(target=elevator.run).start()
+            # A simulation drives the elevators itself instead of giving each one a thread
+            if start_threads:
+                Thread(target=elevator.run).start()
 
-    def request_elevator(self, source_floor: int, destination_floor: int):
+    def get_elevators(self):
+        return self.elevators
+
+    def request_elevator(self, source_floor: int, destination_floor: int, requested_at=None):
         optimal_elevator = self.find_optimal_elevator(source_floor, destination_floor)
-        optimal_elevator.add_request(Request(source_floor, destination_floor))
+        if optimal_elevator.add_request(Request(source_floor, destination_floor, requested_at)):
+            return optimal_elevator
+        return None
+
+    def get_dispatch_stats(self):
+        return self.dispatch_count, self.dispatch_time
 
     def find_optimal_elevator(self, source_floor: int, destination_floor: int) -> Elevator:
-        optimal_elevator = None
-        min_distance = float('inf')
+        start = time.perf_counter()
+        elevator = self.dispatch_policy.select(self.elevators, source_floor, destination_floor)
+        self.dispatch_time += time.perf_counter() - start
+        self.dispatch_count += 1
+        return elevator
 
-        for elevator in self.elevators:
-            distance = abs(source_floor - elevator.current_floor)
-            if distance < min_distance:
-                min_distance = distance
-                optimal_elevator = elevator
+# elevator_dispatch_benchmark.py
+from eta_dispatch_policy import EtaDispatchPolicy
+from nearest_car_policy import NearestCarPolicy
+from simulation_harness import SimulationHarness
+from traffic_pattern import TrafficPattern
+from workload_generator import WorkloadGenerator
 
-        return optimal_elevator
+class ElevatorDispatchBenchmark:
+    CAPACITY = 12
+    SIMULATED_HOURS = 2
+    # (floors, cars, requests per hour)
+    SCENARIOS = [(20, 6, 1200), (40, 12, 2400), (80, 200, 15000)]
+
+    @staticmethod
+    def run():
+        print(f"Morning peak, {ElevatorDispatchBenchmark.SIMULATED_HOURS} simulated hours, LOOK scheduling")
+        for num_floors, num_cars, requests_per_hour in ElevatorDispatchBenchmark.SCENARIOS:
+            workload = WorkloadGenerator(num_floors, seed=11).generate(
+                TrafficPattern.UP_PEAK, requests_per_hour, ElevatorDispatchBenchmark.SIMULATED_HOURS * 3600)
+            print(f"{num_floors} floors, {num_cars} cars, {requests_per_hour} req/h")
+            for name, policy in (("nearest", NearestCarPolicy()), ("ETA", EtaDispatchPolicy())):
+                report = SimulationHarness(num_cars, ElevatorDispatchBenchmark.CAPACITY, dispatch_policy=policy).run(workload)
+                print(f"  {name:<8} {SimulationHarness.format_report(report)}")
+
+if __name__ == "__main__":
+    ElevatorDispatchBenchmark.run()
+
+# elevator_scheduling_benchmark.py
+from fifo_scheduler import FifoScheduler
+from look_scheduler import LookScheduler
+from simulation_harness import SimulationHarness
+from traffic_pattern import TrafficPattern
+from workload_generator import WorkloadGenerator
+
+class ElevatorSchedulingBenchmark:
+    NUM_FLOORS = 30
+    NUM_CARS = 4
+    CAPACITY = 16
+    SIMULATED_HOURS = 8
+    REQUESTS_PER_HOUR = [200, 400, 600]
+
+    @staticmethod
+    def run():
+        print(f"{ElevatorSchedulingBenchmark.NUM_FLOORS} floors, {ElevatorSchedulingBenchmark.NUM_CARS} cars, "
+              f"{ElevatorSchedulingBenchmark.SIMULATED_HOURS} simulated hours of inter-floor traffic")
+        for requests_per_hour in ElevatorSchedulingBenchmark.REQUESTS_PER_HOUR:
+            workload = WorkloadGenerator(ElevatorSchedulingBenchmark.NUM_FLOORS, seed=7).generate(
+                TrafficPattern.INTER_FLOOR, requests_per_hour, ElevatorSchedulingBenchmark.SIMULATED_HOURS * 3600)
+            for name, scheduler in (("FIFO", FifoScheduler), ("LOOK", LookScheduler)):
+                report = SimulationHarness(ElevatorSchedulingBenchmark.NUM_CARS, ElevatorSchedulingBenchmark.CAPACITY,
+                                           scheduler).run(workload)
+                wait = report["wait"]["mean"]
+                travel = report["journey"]["mean"] - wait
+                print(f"{requests_per_hour:>4} req/h {name}: avg wait {wait:>7.1f} s, avg travel {travel:>6.1f} s, "
+                      f"completed {report['completed']:>5}, rejected {report['rejected']:>5}")
+
+if __name__ == "__main__":
+    ElevatorSchedulingBenchmark.run()
+
+# elevator_simulation.py
+import heapq
+import itertools
+from event_type import EventType
+
+class ElevatorSimulation:
+    def __init__(self, controller, floor_travel_time=1.0, door_time=2.0):
+        self.controller = controller
+        self.floor_travel_time = floor_travel_time
+        self.door_time = door_time
+        self.now = 0.0
+        self.events = []
+        self.sequence = itertools.count()
+        self.tokens = itertools.count()
+        # A moving car maps to (departure time, departure floor, target floor, token); a car that is
+        # neither moving nor in doors_open is idle and has no pending event
+        self.motions = {}
+        self.doors_open = set()
+        self.busy_since = {}
+        self.busy_time = 0.0
+        self.completed = []
+        self.rejected = 0
+        self.events_processed = 0
+
+    def get_time(self):
+        return self.now
+
+    def get_completed(self):
+        return self.completed
+
+    def get_rejected(self):
+        return self.rejected
+
+    def get_events_processed(self):
+        return self.events_processed
+
+    def get_utilization(self):
+        # Share of car time spent moving or standing with doors open on a request
+        elevators = self.controller.get_elevators()
+        if not elevators or self.now <= 0:
+            return 0.0
+        busy_time = self.busy_time + sum(self.now - since for since in self.busy_since.values())
+        return busy_time / (len(elevators) * self.now)
+
+    def schedule_request(self, at, source_floor, destination_floor):
+        self._schedule(at, EventType.REQUEST, (source_floor, destination_floor))
+
+    def run(self, until=None):
+        events = self.events
+        while events and (until is None or events[0][0] <= until):
+            at, _, event_type, payload = heapq.heappop(events)
+            self.now = at
+            self.events_processed += 1
+            if event_type is EventType.ARRIVE_FLOOR:
+                self._on_arrive_floor(*payload)
+            elif event_type is EventType.DOOR_OPEN:
+                self._on_door_open(payload)
+            elif event_type is EventType.DOOR_CLOSE:
+                self._on_door_close(payload)
+            else:
+                self._on_request(*payload)
+        if until is not None and until > self.now:
+            self.now = until
+        return self.completed
+
+    def _schedule(self, at, event_type, payload):
+        heapq.heappush(self.events, (at, next(self.sequence), event_type, payload))
+
+    def _on_request(self, source_floor, destination_floor):
+        # Dispatch reads current_floor, so moving cars are first placed on the next floor they can still stop at
+        self._sync_positions()
+        elevator = self.controller.request_elevator(source_floor, destination_floor, self.now)
+        if elevator is None:
+            self.rejected += 1
+            return
+        if elevator in self.doors_open:
+            return
+        motion = self.motions.get(elevator)
+        if motion is None:
+            self._plan(elevator)
+            return
+        target = elevator.next_stop()
+        if target != motion[2]:
+            departure_time, departure_floor, _, _ = motion
+            floor = elevator.current_floor
+            self._depart(elevator, departure_time + abs(floor - departure_floor) * self.floor_travel_time, floor, target)
+
+    def _on_arrive_floor(self, elevator, token):
+        motion = self.motions.get(elevator)
+        if motion is None or motion[3] != token:
+            return
+        del self.motions[elevator]
+        elevator.move_to(motion[2])
+        self.doors_open.add(elevator)
+        self._schedule(self.now, EventType.DOOR_OPEN, elevator)
+
+    def _on_door_open(self, elevator):
+        self.completed.extend(elevator.open_doors(self.now))
+        self._schedule(self.now + self.door_time, EventType.DOOR_CLOSE, elevator)
+
+    def _on_door_close(self, elevator):
+        self.doors_open.discard(elevator)
+        self._plan(elevator)
+
+    def _plan(self, elevator):
+        target = elevator.next_stop()
+        if target is None:
+            since = self.busy_since.pop(elevator, None)
+            if since is not None:
+                self.busy_time += self.now - since
+            return
+        if elevator not in self.busy_since:
+            self.busy_since[elevator] = self.now
+        if target == elevator.current_floor:
+            self.doors_open.add(elevator)
+            self._schedule(self.now, EventType.DOOR_OPEN, elevator)
+        else:
+            self._depart(elevator, self.now, elevator.current_floor, target)
+
+    def _depart(self, elevator, at, floor, target):
+        # Only the arrival at the target is scheduled; floors passed on the way cost no events
+        token = next(self.tokens)
+        self.motions[elevator] = (at, floor, target, token)
+        self._schedule(at + abs(target - floor) * self.floor_travel_time, EventType.ARRIVE_FLOOR, (elevator, token))
+
+    def _sync_positions(self):
+        for elevator, (departure_time, departure_floor, target, _) in self.motions.items():
+            distance = abs(target - departure_floor)
+            travelled = min(-int(-(self.now - departure_time) // self.floor_travel_time), distance)
+            floor = departure_floor + (travelled if target > departure_floor else -travelled)
+            if floor != elevator.current_floor:
+                elevator.move_to(floor)
+
+# elevator_simulation_benchmark.py
+from simulation_harness import SimulationHarness
+from traffic_pattern import TrafficPattern
+from workload_generator import WorkloadGenerator
+
+class ElevatorSimulationBenchmark:
+    SIMULATED_HOURS = 24
+    CAPACITY = 8
+    # (floors, cars, requests per car per hour)
+    SCENARIOS = [(20, 4, 20), (60, 50, 20), (100, 200, 20)]
+
+    @staticmethod
+    def run():
+        print(f"{ElevatorSimulationBenchmark.SIMULATED_HOURS} simulated hours of inter-floor traffic per scenario")
+        for num_floors, num_cars, requests_per_car_hour in ElevatorSimulationBenchmark.SCENARIOS:
+            workload = WorkloadGenerator(num_floors, seed=42).generate(
+                TrafficPattern.INTER_FLOOR, num_cars * requests_per_car_hour, ElevatorSimulationBenchmark.SIMULATED_HOURS * 3600)
+            report = SimulationHarness(num_cars, ElevatorSimulationBenchmark.CAPACITY).run(workload)
+            simulated_hours = report["simulated_seconds"] / 3600
+            print(f"{num_floors:>3} floors, {num_cars:>3} cars: "
+                  f"{simulated_hours / report['wall_seconds'] * 60:>9,.0f} simulated hours/min, "
+                  f"completed {report['completed']:>7,}, rejected {report['rejected']:>6,}, "
+                  f"mean wait {report['wait']['mean']:>6.1f} s")
+
+if __name__ == "__main__":
+    ElevatorSimulationBenchmark.run()
 
 # elevator_system_demo.py
 import time
@@ -114,9 +370,437 @@ class ElevatorSystemDemo:
 if __name__ == "__main__":
     ElevatorSystemDemo.run()
 
+# elevator_traffic_benchmark.py
+from fifo_scheduler import FifoScheduler
+from look_scheduler import LookScheduler
+from nearest_car_policy import NearestCarPolicy
+from simulation_harness import SimulationHarness
+from traffic_pattern import TrafficPattern
+from workload_generator import WorkloadGenerator
+
+class ElevatorTrafficBenchmark:
+    NUM_FLOORS = 30
+    NUM_CARS = 8
+    CAPACITY = 12
+    SIMULATED_HOURS = 2
+    SEED = 2024
+    REQUESTS_PER_HOUR = {
+        TrafficPattern.UP_PEAK: 1800,
+        TrafficPattern.DOWN_PEAK: 1800,
+        TrafficPattern.INTER_FLOOR: 1200,
+        TrafficPattern.LUNCH: 1500,
+    }
+
+    @staticmethod
+    def run():
+        configurations = [
+            ("FIFO + nearest", SimulationHarness(ElevatorTrafficBenchmark.NUM_CARS, ElevatorTrafficBenchmark.CAPACITY,
+                                                 FifoScheduler, NearestCarPolicy())),
+            ("LOOK + ETA", SimulationHarness(ElevatorTrafficBenchmark.NUM_CARS, ElevatorTrafficBenchmark.CAPACITY,
+                                             LookScheduler)),
+        ]
+        print(f"{ElevatorTrafficBenchmark.NUM_FLOORS} floors, {ElevatorTrafficBenchmark.NUM_CARS} cars, "
+              f"{ElevatorTrafficBenchmark.SIMULATED_HOURS} simulated hours per pattern, seed {ElevatorTrafficBenchmark.SEED}")
+        for pattern, requests_per_hour in ElevatorTrafficBenchmark.REQUESTS_PER_HOUR.items():
+            generator = WorkloadGenerator(ElevatorTrafficBenchmark.NUM_FLOORS, ElevatorTrafficBenchmark.SEED)
+            workload = generator.generate(pattern, requests_per_hour, ElevatorTrafficBenchmark.SIMULATED_HOURS * 3600)
+            print(f"{pattern.name} ({len(workload)} requests)")
+            for name, harness in configurations:
+                print(f"  {name:<15} {SimulationHarness.format_report(harness.run(workload))}")
+
+if __name__ == "__main__":
+    ElevatorTrafficBenchmark.run()
+
+# eta_dispatch_policy.py
+from direction import Direction
+from dispatch_policy import DispatchPolicy
+
+class EtaDispatchPolicy(DispatchPolicy):
+    def __init__(self, floor_travel_time=1.0, stop_time=2.0, reversal_time=2.0):
+        self.floor_travel_time = floor_travel_time
+        self.stop_time = stop_time
+        self.reversal_time = reversal_time
+
+    def select(self, elevators, source_floor, destination_floor):
+        # A single pass over per-car snapshots; each is read under that car's lock
+        call_up = destination_floor >= source_floor
+        optimal_elevator = None
+        min_cost = float('inf')
+        least_loaded = None
+        min_pending = float('inf')
+
+        for elevator in elevators:
+            floor, direction, pending, lowest, highest = elevator.get_state()
+            if pending < min_pending:
+                min_pending = pending
+                least_loaded = elevator
+            if pending >= elevator.capacity:
+                continue
+            cost = self.estimate(floor, direction, pending, lowest, highest, source_floor, call_up)
+            if cost < min_cost:
+                min_cost = cost
+                optimal_elevator = elevator
+
+        # Every car is full: the least loaded one rejects the request
+        return optimal_elevator or least_loaded
+
+    def estimate(self, floor, direction, pending, lowest, highest, source_floor, call_up):
+        if pending == 0:
+            return abs(source_floor - floor) * self.floor_travel_time
+        if direction == Direction.UP:
+            if call_up and source_floor >= floor:
+                distance, reversals = source_floor - floor, 0
+            else:
+                top = max(highest, floor, source_floor)
+                if not call_up:
+                    distance, reversals = (top - floor) + (top - source_floor), 1
+                else:
+                    bottom = min(lowest, source_floor)
+                    distance, reversals = (top - floor) + (top - bottom) + (source_floor - bottom), 2
+        else:
+            if not call_up and source_floor <= floor:
+                distance, reversals = floor - source_floor, 0
+            else:
+                bottom = min(lowest, floor, source_floor)
+                if call_up:
+                    distance, reversals = (floor - bottom) + (source_floor - bottom), 1
+                else:
+                    top = max(highest, source_floor)
+                    distance, reversals = (floor - bottom) + (top - bottom) + (top - source_floor), 2
+        # Every queued request costs at least one stop before this car is free
+        return distance * self.floor_travel_time + pending * self.stop_time + reversals * self.reversal_time
+
+# event_type.py
+from enum import Enum
+
+class EventType(Enum):
+    REQUEST = 1
+    ARRIVE_FLOOR = 2
+    DOOR_OPEN = 3
+    DOOR_CLOSE = 4
+
+# fifo_scheduler.py
+from collections import deque
+from direction import Direction
+from request_scheduler import RequestScheduler
+
+class FifoScheduler(RequestScheduler):
+    def __init__(self):
+        self.requests = deque()
+
+    def add(self, request):
+        self.requests.append(request)
+
+    def size(self):
+        return len(self.requests)
+
+    def next_stop(self, current_floor, direction):
+        if not self.requests:
+            return None, direction
+        request = self.requests[0]
+        stop = request.destination_floor if request.picked_up else request.source_floor
+        if stop != current_floor:
+            direction = Direction.UP if stop > current_floor else Direction.DOWN
+        return stop, direction
+
+    def stop_range(self):
+        if not self.requests:
+            return None, None
+        floors = [request.destination_floor for request in self.requests]
+        floors.extend(request.source_floor for request in self.requests if not request.picked_up)
+        return min(floors), max(floors)
+
+    def serve(self, current_floor, direction, now):
+        # Strict arrival order: only the oldest request is ever served
+        completed = []
+        while self.requests and self.next_stop(current_floor, direction)[0] == current_floor:
+            request = self.requests[0]
+            if not request.picked_up:
+                request.picked_up = True
+                request.picked_up_at = now
+            else:
+                self.requests.popleft()
+                request.completed_at = now
+                completed.append(request)
+        return completed, direction
+
+# look_scheduler.py
+from bisect import bisect_left, bisect_right, insort
+from direction import Direction
+from request_scheduler import RequestScheduler
+
+class LookScheduler(RequestScheduler):
+    def __init__(self):
+        # Sorted floors with a pending stop for passengers travelling in each direction
+        self.stops = {Direction.UP: [], Direction.DOWN: []}
+        self.stop_counts = {Direction.UP: {}, Direction.DOWN: {}}
+        self.pickups = {}
+        self.dropoffs = {}
+        self.pending = 0
+
+    def add(self, request):
+        direction = self._direction_of(request)
+        self.pickups.setdefault((request.source_floor, direction), []).append(request)
+        self._add_stop(request.source_floor, direction)
+        self.pending += 1
+
+    def size(self):
+        return self.pending
+
+    def next_stop(self, current_floor, direction):
+        if not self.pending:
+            return None, direction
+        for _ in range(2):
+            if direction == Direction.UP:
+                up_stops = self.stops[Direction.UP]
+                i = bisect_left(up_stops, current_floor)
+                if i < len(up_stops):
+                    return up_stops[i], Direction.UP
+                # Rides up to the highest down call before sweeping down
+                down_stops = self.stops[Direction.DOWN]
+                if down_stops and down_stops[-1] > current_floor:
+                    return down_stops[-1], Direction.UP
+                direction = Direction.DOWN
+            else:
+                down_stops = self.stops[Direction.DOWN]
+                i = bisect_right(down_stops, current_floor)
+                if i:
+                    return down_stops[i - 1], Direction.DOWN
+                up_stops = self.stops[Direction.UP]
+                if up_stops and up_stops[0] < current_floor:
+                    return up_stops[0], Direction.DOWN
+                direction = Direction.UP
+        return None, direction
+
+    def stop_range(self):
+        up_stops = self.stops[Direction.UP]
+        down_stops = self.stops[Direction.DOWN]
+        if not up_stops:
+            return (down_stops[0], down_stops[-1]) if down_stops else (None, None)
+        if not down_stops:
+            return up_stops[0], up_stops[-1]
+        return min(up_stops[0], down_stops[0]), max(up_stops[-1], down_stops[-1])
+
+    def serve(self, current_floor, direction, now):
+        completed = []
+        riders = self.dropoffs.pop(current_floor, None)
+        if riders:
+            for request in riders:
+                self._remove_stop(current_floor, self._direction_of(request))
+                request.completed_at = now
+                completed.append(request)
+            self.pending -= len(riders)
+        self._board(current_floor, direction, now, completed)
+        # Turning around at this floor picks up the opposite direction without reopening the doors
+        stop, next_direction = self.next_stop(current_floor, direction)
+        if stop == current_floor and next_direction != direction:
+            direction = next_direction
+            self._board(current_floor, direction, now, completed)
+        return completed, direction
+
+    def _board(self, floor, direction, now, completed):
+        boarding = self.pickups.pop((floor, direction), None)
+        if not boarding:
+            return
+        for request in boarding:
+            self._remove_stop(floor, direction)
+            request.picked_up = True
+            request.picked_up_at = now
+            if request.destination_floor == floor:
+                request.completed_at = now
+                completed.append(request)
+                self.pending -= 1
+            else:
+                self.dropoffs.setdefault(request.destination_floor, []).append(request)
+                self._add_stop(request.destination_floor, direction)
+
+    def _add_stop(self, floor, direction):
+        counts = self.stop_counts[direction]
+        count = counts.get(floor, 0)
+        if count == 0:
+            insort(self.stops[direction], floor)
+        counts[floor] = count + 1
+
+    def _remove_stop(self, floor, direction):
+        counts = self.stop_counts[direction]
+        count = counts[floor] - 1
+        if count == 0:
+            del counts[floor]
+            stops = self.stops[direction]
+            del stops[bisect_left(stops, floor)]
+        else:
+            counts[floor] = count
+
+    def _direction_of(self, request):
+        return Direction.DOWN if request.destination_floor < request.source_floor else Direction.UP
+
+# nearest_car_policy.py
+from dispatch_policy import DispatchPolicy
+
+class NearestCarPolicy(DispatchPolicy):
+    def select(self, elevators, source_floor, destination_floor):
+        optimal_elevator = None
+        min_distance = float('inf')
+
+        for elevator in elevators:
+            distance = abs(source_floor - elevator.get_state()[0])
+            if distance < min_distance:
+                min_distance = distance
+                optimal_elevator = elevator
+
+        return optimal_elevator
+
 # request.py
 class Request:
-    def __init__(self, source_floor, destination_floor):
+    __slots__ = ("source_floor", "destination_floor", "requested_at", "picked_up", "picked_up_at", "completed_at")
+
+    def __init__(self, source_floor, destination_floor, requested_at=None):
         self.source_floor = source_floor
         self.destination_floor = destination_floor
+        self.requested_at = requested_at
+        self.picked_up = False
+        self.picked_up_at = None
+        self.completed_at = None
+
+# request_scheduler.py
+from abc import ABC, abstractmethod
+
+class RequestScheduler(ABC):
+    @abstractmethod
+    def add(self, request):
+        pass
+
+    @abstractmethod
+    def size(self):
+        pass
+
+    # Returns the next floor to stop at (None when idle) and the direction the car will be sweeping in
+    @abstractmethod
+    def next_stop(self, current_floor, direction):
+        pass
+
+    # Returns the lowest and highest floors with a pending stop, or (None, None) when idle
+    @abstractmethod
+    def stop_range(self):
+        pass
+
+    # Boards and drops off passengers at the floor; returns the completed requests and the new direction
+    @abstractmethod
+    def serve(self, current_floor, direction, now):
+        pass
+
+# simulation_harness.py
+import time
+from elevator_controller import ElevatorController
+from elevator_simulation import ElevatorSimulation
+from look_scheduler import LookScheduler
+
+class SimulationHarness:
+    def __init__(self, num_cars, capacity, scheduler=LookScheduler, dispatch_policy=None, floor_travel_time=1.0,
+                 door_time=2.0):
+        self.num_cars = num_cars
+        self.capacity = capacity
+        self.scheduler = scheduler
+        self.dispatch_policy = dispatch_policy
+        self.floor_travel_time = floor_travel_time
+        self.door_time = door_time
+
+    def run(self, workload):
+        # A fresh controller per run, so the same workload can be replayed against several configurations
+        controller = ElevatorController(self.num_cars, self.capacity, start_threads=False, verbose=False,
+                                        scheduler=self.scheduler, dispatch_policy=self.dispatch_policy)
+        simulation = ElevatorSimulation(controller, self.floor_travel_time, self.door_time)
+        for at, source_floor, destination_floor in workload:
+            simulation.schedule_request(at, source_floor, destination_floor)
+
+        start = time.perf_counter()
+        completed = simulation.run()
+        elapsed = time.perf_counter() - start
+        dispatch_count, dispatch_time = controller.get_dispatch_stats()
+        return {
+            "requests": len(workload),
+            "completed": len(completed),
+            "rejected": simulation.get_rejected(),
+            "wait": self.summarize([request.picked_up_at - request.requested_at for request in completed]),
+            "journey": self.summarize([request.completed_at - request.requested_at for request in completed]),
+            "utilization": simulation.get_utilization(),
+            "dispatch_us": dispatch_time / dispatch_count * 1e6 if dispatch_count else 0.0,
+            "simulated_seconds": simulation.get_time(),
+            "wall_seconds": elapsed,
+        }
+
+    @staticmethod
+    def summarize(samples):
+        if not samples:
+            return {"mean": 0.0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+        samples.sort()
+        return {
+            "mean": sum(samples) / len(samples),
+            "p50": SimulationHarness.percentile(samples, 50),
+            "p90": SimulationHarness.percentile(samples, 90),
+            "p99": SimulationHarness.percentile(samples, 99),
+            "max": samples[-1],
+        }
+
+    @staticmethod
+    def percentile(sorted_samples, percent):
+        # Nearest-rank percentile
+        rank = max(-(-len(sorted_samples) * percent // 100), 1)
+        return sorted_samples[int(rank) - 1]
+
+    @staticmethod
+    def format_report(report):
+        wait = report["wait"]
+        journey = report["journey"]
+        return (f"wait p50/p90/p99 {wait['p50']:>5.1f}/{wait['p90']:>5.1f}/{wait['p99']:>6.1f} s, "
+                f"journey p50/p90/p99 {journey['p50']:>5.1f}/{journey['p90']:>5.1f}/{journey['p99']:>6.1f} s, "
+                f"utilization {report['utilization']:>4.0%}, rejected {report['rejected']:>5}, "
+                f"dispatch {report['dispatch_us']:>6.1f} us")
+
+# traffic_pattern.py
+from enum import Enum
+
+class TrafficPattern(Enum):
+    UP_PEAK = 1
+    DOWN_PEAK = 2
+    INTER_FLOOR = 3
+    LUNCH = 4
+
+# workload_generator.py
+import random
+from traffic_pattern import TrafficPattern
+
+class WorkloadGenerator:
+    # Share of trips (from the lobby, to the lobby); the rest travel between two upper floors
+    MIXES = {
+        TrafficPattern.UP_PEAK: (0.85, 0.05),
+        TrafficPattern.DOWN_PEAK: (0.05, 0.85),
+        TrafficPattern.INTER_FLOOR: (0.05, 0.05),
+        TrafficPattern.LUNCH: (0.45, 0.45),
+    }
+
+    def __init__(self, num_floors, seed=0, lobby_floor=1):
+        self.num_floors = num_floors
+        self.lobby_floor = lobby_floor
+        self.upper_floors = [floor for floor in range(1, num_floors + 1) if floor != lobby_floor]
+        self.rng = random.Random(seed)
+
+    def generate(self, pattern, requests_per_hour, duration, start=0.0):
+        # Poisson arrivals; returns (time, source floor, destination floor) tuples in time order
+        from_lobby, to_lobby = self.MIXES[pattern]
+        rate = requests_per_hour / 3600
+        rng = self.rng
+        workload = []
+        at = start + rng.expovariate(rate)
+        while at < start + duration:
+            kind = rng.random()
+            if kind < from_lobby:
+                trip = (self.lobby_floor, rng.choice(self.upper_floors))
+            elif kind < from_lobby + to_lobby:
+                trip = (rng.choice(self.upper_floors), self.lobby_floor)
+            else:
+                trip = tuple(rng.sample(self.upper_floors, 2))
+            workload.append((at, trip[0], trip[1]))
+            at += rng.expovariate(rate)
+        return workload
 
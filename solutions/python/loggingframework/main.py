@@ -1,43 +1,543 @@
+# async_appender.py
+import atexit
+from collections import deque
+from threading import Condition, Thread
+from log_appender import LogAppender
+from log_level import LogLevel
+from overflow_policy import OverflowPolicy
+
+class AsyncAppender(LogAppender):
+    def __init__(self, appender, capacity=10000, batch_size=256, overflow_policy=OverflowPolicy.BLOCK):
+        self.appender = appender
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self.queue = deque()
+        self.debug_count = 0
+        self.dropped_count = 0
+        self.in_flight = 0
+        self.closed = False
+        self.condition = Condition()
+        self.worker = Thread(target=self._drain, daemon=True)
+        self.worker.start()
+        atexit.register(self.close)
+
+    def append(self, log_message):
+        with self.condition:
+            if self.closed:
+                return
+            if len(self.queue) >= self.capacity and not self._make_room(log_message):
+                self.dropped_count += 1
+                return
+            self.queue.append(log_message)
+            if log_message.get_level() == LogLevel.DEBUG:
+                self.debug_count += 1
+            self.condition.notify_all()
+
+    def flush(self):
+        with self.condition:
+            while self.queue or self.in_flight:
+                self.condition.wait()
+
+    def close(self):
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify_all()
+        self.worker.join()
+        self.appender.close()
+        atexit.unregister(self.close)
+
+    def get_dropped_count(self):
+        return self.dropped_count
+
+    def _make_room(self, log_message):
+        # Returns False when the incoming message should be dropped instead
+        if self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+            self._untrack(self.queue.popleft())
+            self.dropped_count += 1
+            return True
+        if self.overflow_policy == OverflowPolicy.DROP_DEBUG_FIRST:
+            if log_message.get_level() == LogLevel.DEBUG:
+                return False
+            if self.debug_count:
+                for queued_message in self.queue:
+                    if queued_message.get_level() == LogLevel.DEBUG:
+                        self.queue.remove(queued_message)
+                        break
+                self.debug_count -= 1
+                self.dropped_count += 1
+                return True
+        while len(self.queue) >= self.capacity and not self.closed:
+            self.condition.wait()
+        return not self.closed
+
+    def _untrack(self, log_message):
+        if log_message.get_level() == LogLevel.DEBUG:
+            self.debug_count -= 1
+
+    def _append_one_by_one(self, batch):
+        # Retries a failed batch record by record so one bad record does not take the others with it
+        for log_message in batch:
+            try:
+                self.appender.append(log_message)
+            except Exception as e:
+                print(f"Error: {e}")
+
+    def _drain(self):
+        while True:
+            with self.condition:
+                while not self.queue and not self.closed:
+                    self.condition.wait()
+                if not self.queue:
+                    return
+                batch = [self.queue.popleft() for _ in range(min(self.batch_size, len(self.queue)))]
+                for log_message in batch:
+                    self._untrack(log_message)
+                self.in_flight = len(batch)
+                self.condition.notify_all()
+            try:
+                self.appender.append_batch(batch)
+            except Exception as e:
+                print(f"Error: {e}")
+                self._append_one_by_one(batch)
+            with self.condition:
+                self.in_flight = 0
+                self.condition.notify_all()
+
+# binary_file_appender.py
+from binary_log_codec import BinaryLogCodec
+from file_appender import FileAppender
+
+class BinaryFileAppender(FileAppender):
+    def _encode(self, log_message):
+        return BinaryLogCodec.encode(log_message)
+    
+    def _open(self):
+        super()._open()
+        if self.bytes_written == 0:
+            self.file.write(BinaryLogCodec.MAGIC)
+            self.bytes_written = len(BinaryLogCodec.MAGIC)
+
+# binary_log_benchmark.py
+import os
+import random
+import re
+import tempfile
+import time
+from binary_file_appender import BinaryFileAppender
+from binary_log_reader import BinaryLogReader
+from file_appender import FileAppender
+from log_level import LogLevel
+from log_message import LogMessage
+
+class BinaryLogBenchmark:
+    NUM_MESSAGES = 500000
+    TEXT_PATTERN = re.compile(rb"^\[LogLevel\.(ERROR|FATAL)\] (\d+) - (.*)$", re.MULTILINE)
+
+    @staticmethod
+    def make_messages():
+        rng = random.Random(7)
+        levels = list(LogLevel)
+        start = 1700000000000
+        return [LogMessage(rng.choices(levels, weights=(40, 40, 15, 4, 1))[0],
+                           f"worker {rng.randrange(64)} handled request {i} in {rng.randrange(500)} ms",
+                           timestamp=start + i) for i in range(BinaryLogBenchmark.NUM_MESSAGES)]
+
+    @staticmethod
+    def grep_text(file_path, start_time, end_time):
+        with open(file_path, "rb") as file:
+            content = file.read()
+        return sum(1 for match in BinaryLogBenchmark.TEXT_PATTERN.finditer(content)
+                   if start_time <= int(match.group(2)) <= end_time)
+
+    @staticmethod
+    def timed(function):
+        start = time.perf_counter()
+        result = function()
+        return result, time.perf_counter() - start
+
+    @staticmethod
+    def run():
+        messages = BinaryLogBenchmark.make_messages()
+        start_time = messages[len(messages) // 4].get_timestamp()
+        end_time = messages[3 * len(messages) // 4].get_timestamp()
+        with tempfile.TemporaryDirectory() as directory:
+            text_path = os.path.join(directory, "app.log")
+            binary_path = os.path.join(directory, "app.logb")
+            for appender in (FileAppender(text_path), BinaryFileAppender(binary_path)):
+                appender.append_batch(messages)
+                appender.close()
+            reader = BinaryLogReader(binary_path)
+            runs = (
+                ("text regex scan", lambda: BinaryLogBenchmark.grep_text(text_path, start_time, end_time)),
+                ("binary count", lambda: reader.count(LogLevel.ERROR, start_time, end_time)),
+                ("binary decode", lambda: sum(1 for _ in reader.read(LogLevel.ERROR, start_time, end_time))),
+            )
+            print(f"text {os.path.getsize(text_path):,} bytes, binary {os.path.getsize(binary_path):,} bytes")
+            for name, function in runs:
+                matches, elapsed = BinaryLogBenchmark.timed(function)
+                print(f"{name:>16}: {matches:,} ERROR+ records in {elapsed * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    BinaryLogBenchmark.run()
+
+# binary_log_codec.py
+import struct
+
+class BinaryLogCodec:
+    MAGIC = b"LOGB\x01"
+    # level (1 byte), timestamp in ms (8 bytes), message length (4 bytes), then the UTF-8 message
+    HEADER = struct.Struct("<BqI")
+
+    @staticmethod
+    def encode(log_message):
+        body = log_message.get_message().encode("utf-8")
+        return BinaryLogCodec.HEADER.pack(log_message.get_level().value, log_message.get_timestamp(), len(body)) + body
+
+# binary_log_reader.py
+import mmap
+from binary_log_codec import BinaryLogCodec
+from log_level import LogLevel
+from log_message import LogMessage
+
+class BinaryLogReader:
+    def __init__(self, file_path):
+        self.file_path = file_path
+    
+    def read(self, min_level=None, start_time=None, end_time=None):
+        for level_value, timestamp, body in self._scan(min_level, start_time, end_time, True):
+            yield LogMessage(LogLevel(level_value), body.decode("utf-8"), timestamp=timestamp)
+    
+    def count(self, min_level=None, start_time=None, end_time=None):
+        return sum(1 for _ in self._scan(min_level, start_time, end_time, False))
+    
+    def _scan(self, min_level, start_time, end_time, with_body):
+        min_value = min_level.value if min_level else 0
+        start_time = start_time if start_time is not None else -(1 << 63)
+        end_time = end_time if end_time is not None else (1 << 63) - 1
+        header = BinaryLogCodec.HEADER
+        header_size = header.size
+        with open(self.file_path, "rb") as file:
+            if file.seek(0, 2) <= len(BinaryLogCodec.MAGIC):
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if buffer[:len(BinaryLogCodec.MAGIC)] != BinaryLogCodec.MAGIC:
+                    raise ValueError(f"{self.file_path} is not a binary log file")
+                offset = len(BinaryLogCodec.MAGIC)
+                end = len(buffer)
+                # Headers are checked first; bodies are only copied out for matching records
+                while offset + header_size <= end:
+                    level_value, timestamp, length = header.unpack_from(buffer, offset)
+                    offset += header_size
+                    if level_value >= min_value and start_time <= timestamp <= end_time:
+                        yield level_value, timestamp, buffer[offset:offset + length] if with_body else None
+                    offset += length
+
+# connection_pool.py
+from threading import Condition
+
+class ConnectionPool:
+    def __init__(self, connect, max_size=4):
+        self.connect = connect
+        self.max_size = max_size
+        self.idle = []
+        self.created = 0
+        self.condition = Condition()
+
+    def acquire(self):
+        with self.condition:
+            # A waiter wakes on release (to reuse a connection) or discard (to open a replacement)
+            while not self.idle and self.created >= self.max_size:
+                self.condition.wait()
+            if self.idle:
+                return self.idle.pop()
+            self.created += 1
+        try:
+            return self.connect()
+        except Exception:
+            with self.condition:
+                self.created -= 1
+                self.condition.notify()
+            raise
+
+    def release(self, connection):
+        with self.condition:
+            self.idle.append(connection)
+            self.condition.notify()
+
+    def discard(self, connection):
+        with self.condition:
+            self.created -= 1
+            self.condition.notify()
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self.condition:
+            connections, self.idle = self.idle, []
+        for connection in connections:
+            self.discard(connection)
+
 # console_appender.py
+import sys
+from threading import Lock
 from log_appender import LogAppender
 
 class ConsoleAppender(LogAppender):
+    def __init__(self):
+        self.lock = Lock()
+
     def append(self, log_message):
-        print(log_message)
+        # One write per line under a lock, so lines from concurrent threads never mix
+        line = str(log_message) + "\n"
+        with self.lock:
+            sys.stdout.write(line)
 
 # database_appender.py
 import psycopg2
-from log_appender import LogAppender
+from psycopg2.extras import execute_values
+from pooled_database_appender import PooledDatabaseAppender
 
-class DatabaseAppender(LogAppender):
-    def __init__(self, db_url, username, password):
+class DatabaseAppender(PooledDatabaseAppender):
+    errors = (psycopg2.Error,)
+    
+    def __init__(self, db_url, username, password, batch_size=500, flush_interval=1.0, pool_size=4):
         self.db_url = db_url
         self.username = username
         self.password = password
+        super().__init__(batch_size, flush_interval, pool_size)
+    
+    def _connect(self):
+        return psycopg2.connect(self.db_url, self.username, self.password)
     
+    def _insert_rows(self, cursor, rows):
+        execute_values(cursor, "INSERT INTO logs (level, message, timestamp) VALUES %s", rows)
+
+# database_appender_benchmark.py
+import os
+import sqlite3
+import tempfile
+import time
+from log_appender import LogAppender
+from log_level import LogLevel
+from log_message import LogMessage
+from sqlite_appender import SQLiteAppender
+
+class ConnectPerMessageSQLiteAppender(LogAppender):
+    # The previous DatabaseAppender behaviour, pointed at SQLite
+    def __init__(self, db_path):
+        self.db_path = db_path
+
     def append(self, log_message):
-        try:
-            connection = psycopg2.connect(self.db_url, self.username, self.password)
-            cursor = connection.cursor()
-            cursor.execute("INSERT INTO logs (level, message, timestamp) VALUES (%s, %s, %s)",
-                           (log_message.get_level().name, log_message.get_message(), log_message.get_timestamp()))
-            connection.commit()
-            cursor.close()
-            connection.close()
-        except psycopg2.Error as e:
-            print(f"Error: {e}")
+        connection = sqlite3.connect(self.db_path)
+        cursor = connection.cursor()
+        cursor.execute("INSERT INTO logs (level, message, timestamp) VALUES (?, ?, ?)",
+                       (log_message.get_level().name, log_message.get_message(), log_message.get_timestamp()))
+        connection.commit()
+        cursor.close()
+        connection.close()
+
+class DatabaseAppenderBenchmark:
+    NUM_MESSAGES = 20000
+
+    @staticmethod
+    def count_rows(db_path):
+        connection = sqlite3.connect(db_path)
+        count = connection.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+        connection.close()
+        return count
+
+    @staticmethod
+    def create_messages():
+        # LogMessage caches its formatted text, so every appender gets fresh messages and pays for formatting
+        return [LogMessage(LogLevel.INFO, f"order {i} shipped") for i in range(DatabaseAppenderBenchmark.NUM_MESSAGES)]
+
+    @staticmethod
+    def run():
+        with tempfile.TemporaryDirectory() as directory:
+            baseline_path = os.path.join(directory, "baseline.db")
+            pooled_path = os.path.join(directory, "pooled.db")
+            # Creating the pooled appender also creates the shared schema
+            pooled = SQLiteAppender(pooled_path)
+            SQLiteAppender(baseline_path).close()
+            appenders = (("connect per message", ConnectPerMessageSQLiteAppender(baseline_path), baseline_path),
+                         ("pooled + batched", pooled, pooled_path))
+            for name, appender, db_path in appenders:
+                messages = DatabaseAppenderBenchmark.create_messages()
+                start = time.perf_counter()
+                for log_message in messages:
+                    appender.append(log_message)
+                appender.close()
+                rate = len(messages) / (time.perf_counter() - start)
+                rows = DatabaseAppenderBenchmark.count_rows(db_path)
+                print(f"{name:>20}: {rate:>10,.0f} messages/s ({rows:,} rows written)")
+
+if __name__ == "__main__":
+    DatabaseAppenderBenchmark.run()
 
 # file_appender.py
+import atexit
+import glob
+import gzip
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
 from log_appender import LogAppender
 
 class FileAppender(LogAppender):
-    def __init__(self, file_path):
+    def __init__(self, file_path, buffer_size=64 * 1024, flush_interval=1.0, max_bytes=0,
+                 rotate_interval=0, backup_count=5, compress=False):
         self.file_path = file_path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compressor = ThreadPoolExecutor(max_workers=1) if compress else None
+        self.rotation_count = 0
+        self.lock = Lock()
+        self._open()
+        self.stopped = Event()
+        self.flusher = None
+        if flush_interval:
+            self.flusher = Thread(target=self._flush_periodically, daemon=True)
+            self.flusher.start()
+        atexit.register(self.close)
+    
+    def append(self, log_message):
+        self._write(self._encode(log_message))
+    
+    def append_batch(self, log_messages):
+        self._write(b"".join(self._encode(log_message) for log_message in log_messages))
+    
+    def flush(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.flush()
+    
+    def close(self):
+        self.stopped.set()
+        if self.flusher is not None:
+            self.flusher.join()
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+        if self.compressor is not None:
+            self.compressor.shutdown(wait=True)
+        atexit.unregister(self.close)
     
+    def _encode(self, log_message):
+        return (str(log_message) + "\n").encode("utf-8")
+    
+    def _open(self):
+        self.file = open(self.file_path, "ab", buffering=self.buffer_size)
+        self.bytes_written = self.file.tell()
+        self.rollover_at = time.time() + self.rotate_interval if self.rotate_interval else None
+    
+    def _write(self, data):
+        with self.lock:
+            if self.file is None:
+                return
+            if self._should_rotate(len(data)):
+                self._rotate()
+            self.file.write(data)
+            self.bytes_written += len(data)
+    
+    def _should_rotate(self, size):
+        if self.max_bytes and self.bytes_written and self.bytes_written + size > self.max_bytes:
+            return True
+        return self.rollover_at is not None and time.time() >= self.rollover_at
+    
+    def _rotate(self):
+        self.file.close()
+        self.rotation_count += 1
+        rotated_path = f"{self.file_path}.{time.strftime('%Y%m%d-%H%M%S')}-{self.rotation_count:04d}"
+        os.replace(self.file_path, rotated_path)
+        self._open()
+        # Compression and cleanup run off the logging path; the single worker keeps them ordered
+        if self.compressor is not None:
+            self.compressor.submit(self._compress_and_clean_up, rotated_path)
+        else:
+            self._clean_up()
+    
+    def _compress_and_clean_up(self, rotated_path):
+        try:
+            with open(rotated_path, "rb") as source, gzip.open(rotated_path + ".gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(rotated_path)
+            self._clean_up()
+        except OSError as e:
+            print(f"Error: {e}")
+    
+    def _clean_up(self):
+        # Only finished backups count; files still waiting for compression are left alone
+        pattern = glob.escape(self.file_path) + (".*.gz" if self.compressor is not None else ".*")
+        backups = sorted(glob.glob(pattern))
+        for backup in backups[:max(0, len(backups) - self.backup_count)]:
+            os.remove(backup)
+    
+    def _flush_periodically(self):
+        while not self.stopped.wait(self.flush_interval):
+            self.flush()
+
+# file_appender_benchmark.py
+import os
+import tempfile
+import time
+from file_appender import FileAppender
+from log_appender import LogAppender
+from log_level import LogLevel
+from log_message import LogMessage
+
+class OpenPerMessageFileAppender(LogAppender):
+    # The previous FileAppender behaviour, kept as the baseline
+    def __init__(self, file_path):
+        self.file_path = file_path
+
     def append(self, log_message):
         with open(self.file_path, "a") as file:
             file.write(str(log_message) + "\n")
 
+class FileAppenderBenchmark:
+    NUM_MESSAGES = 100000
+
+    @staticmethod
+    def create_messages():
+        # LogMessage caches its rendered line, so every appender gets fresh messages and pays for formatting
+        return [LogMessage(LogLevel.INFO, f"request {i} served in {i % 97} ms")
+                for i in range(FileAppenderBenchmark.NUM_MESSAGES)]
+
+    @staticmethod
+    def measure(appender, messages):
+        start = time.perf_counter()
+        for log_message in messages:
+            appender.append(log_message)
+        appender.close()
+        return len(messages) / (time.perf_counter() - start)
+
+    @staticmethod
+    def run():
+        with tempfile.TemporaryDirectory() as directory:
+            appenders = (
+                ("open per message", OpenPerMessageFileAppender(os.path.join(directory, "baseline.log"))),
+                ("buffered", FileAppender(os.path.join(directory, "buffered.log"))),
+                ("buffered + rotation", FileAppender(os.path.join(directory, "rotated.log"),
+                                                     max_bytes=1024 * 1024, compress=True)),
+            )
+            for name, appender in appenders:
+                rate = FileAppenderBenchmark.measure(appender, FileAppenderBenchmark.create_messages())
+                print(f"{name:>20}: {rate:>12,.0f} messages/s")
+
+if __name__ == "__main__":
+    FileAppenderBenchmark.run()
+
 # log_appender.py
 from abc import ABC, abstractmethod
 
@@ -46,6 +546,13 @@ class LogAppender(ABC):
     def append(self, log_message):
         pass
 
+    def append_batch(self, log_messages):
+        for log_message in log_messages:
+            self.append(log_message)
+
+    def close(self):
+        pass
+
 # log_level.py
 from enum import Enum
 
@@ -60,24 +567,42 @@ class LogLevel(Enum):
 import time
 
 class LogMessage:
-    def __init__(self, level, message):
+    __slots__ = ("level", "message", "args", "timestamp", "formatted_message", "rendered")
+    
+    def __init__(self, level, message, args=(), timestamp=None):
         self.level = level
         self.message = message
-        self.timestamp = int(time.time() * 1000)
+        self.args = args
+        self.timestamp = int(time.time() * 1000) if timestamp is None else timestamp
+        self.formatted_message = None
+        self.rendered = None
     
     def get_level(self):
         return self.level
     
     def get_message(self):
-        return self.message
+        # %-style arguments are only formatted once a message is actually appended
+        if self.formatted_message is None:
+            self.formatted_message = self._format() if self.args else self.message
+        return self.formatted_message
     
     def get_timestamp(self):
         return self.timestamp
     
+    def _format(self):
+        # A bad format string or argument must not raise in the caller or lose the rest of a batch
+        try:
+            return self.message % self.args
+        except Exception as e:
+            return "<unformattable: %r %% %r (%s)>" % (self.message, self.args, e)
+    
     def __str__(self):
-        return f"[{self.level}] {self.timestamp} - {self.message}"
+        if self.rendered is None:
+            self.rendered = "[%s] %d - %s" % (self.level, self.timestamp, self.get_message())
+        return self.rendered
 
 # logger.py
+from threading import RLock
 from logger_config import LoggerConfig
 from log_level import LogLevel
 from log_message import LogMessage
@@ -85,66 +610,271 @@ from console_appender import ConsoleAppender
 
 class Logger:
     _instance = None
+    _loggers = {}
+    _lock = RLock()
     
-    def __init__(self):
-        if Logger._instance is not None:
+    def __init__(self, name="root", parent=None):
+        if parent is None and Logger._instance is not None:
             raise Exception("This class is a singleton!")
-        else:
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.config = None
+        self.propagate = True
+        # Resolved once per configuration change so log() never walks the hierarchy
+        self.threshold = 0
+        self.targets = ()
+        if parent is None:
             Logger._instance = self
-            self.config = LoggerConfig(LogLevel.INFO, ConsoleAppender())
+            self.set_config(LoggerConfig(LogLevel.INFO, ConsoleAppender()))
+        else:
+            parent.children.append(self)
+            self._refresh()
     
     @staticmethod
     def get_instance():
-        if Logger._instance is None:
-            Logger()
-        return Logger._instance
+        with Logger._lock:
+            if Logger._instance is None:
+                Logger()
+            return Logger._instance
+    
+    @staticmethod
+    def get_logger(name):
+        if not name or name == "root":
+            return Logger.get_instance()
+        with Logger._lock:
+            logger = Logger._loggers.get(name)
+            if logger is None:
+                parent = Logger.get_logger(name.rpartition(".")[0])
+                logger = Logger._loggers[name] = Logger(name, parent)
+            return logger
     
     def set_config(self, config):
-        self.config = config
+        with Logger._lock:
+            if self.config is not None:
+                self.config.remove_listener(self._refresh)
+            self.config = config
+            if config is not None:
+                config.add_listener(self._refresh)
+            self._refresh()
+    
+    def set_propagate(self, propagate):
+        with Logger._lock:
+            self.propagate = propagate
+            self._refresh()
+    
+    def get_effective_level(self):
+        logger = self
+        while logger.config is None:
+            logger = logger.parent
+        return logger.config.get_log_level()
+    
+    def is_enabled_for(self, level):
+        return level.value >= self.threshold
+    
+    def log(self, level, message, *args):
+        value = level.value
+        if value >= self.threshold:
+            log_message = LogMessage(level, message, args)
+            for appender, appender_threshold in self.targets:
+                if value >= appender_threshold:
+                    appender.append(log_message)
     
-    def log(self, level, message):
-        if level.value >= self.config.get_log_level().value:
-            log_message = LogMessage(level, message)
-            self.config.get_log_appender().append(log_message)
+    def debug(self, message, *args):
+        self.log(LogLevel.DEBUG, message, *args)
     
-    def debug(self, message):
-        self.log(LogLevel.DEBUG, message)
+    def info(self, message, *args):
+        self.log(LogLevel.INFO, message, *args)
     
-    def info(self, message):
-        self.log(LogLevel.INFO, message)
+    def warning(self, message, *args):
+        self.log(LogLevel.WARNING, message, *args)
     
-    def warning(self, message):
-        self.log(LogLevel.WARNING, message)
+    def error(self, message, *args):
+        self.log(LogLevel.ERROR, message, *args)
     
-    def error(self, message):
-        self.log(LogLevel.ERROR, message)
+    def fatal(self, message, *args):
+        self.log(LogLevel.FATAL, message, *args)
     
-    def fatal(self, message):
-        self.log(LogLevel.FATAL, message)
+    def _refresh(self):
+        with Logger._lock:
+            level_threshold = self.get_effective_level().value
+            targets = []
+            logger = self
+            while logger is not None:
+                config = logger.config
+                if config is not None:
+                    # Ancestor appenders still honour the level of the config they belong to
+                    targets.extend((appender, max(threshold, config.threshold, level_threshold))
+                                   for appender, threshold in config.appenders)
+                logger = logger.parent if logger.propagate else None
+            self.targets = tuple(targets)
+            self.threshold = min((threshold for _, threshold in targets), default=LogLevel.FATAL.value + 1)
+            for child in self.children:
+                child._refresh()
 
 # logger_config.py
 class LoggerConfig:
-    def __init__(self, log_level, log_appender):
+    def __init__(self, log_level, log_appender=None, appender_level=None):
         self.log_level = log_level
-        self.log_appender = log_appender
+        self.threshold = log_level.value
+        self.appenders = []
+        self.listeners = []
+        if log_appender is not None:
+            self.appenders.append((log_appender, appender_level.value if appender_level else 0))
     
     def get_log_level(self):
         return self.log_level
     
     def set_log_level(self, log_level):
         self.log_level = log_level
+        # Cached so level checks compare two ints instead of resolving enum values
+        self.threshold = log_level.value
+        self._notify()
     
     def get_log_appender(self):
-        return self.log_appender
+        return self.appenders[0][0] if self.appenders else None
     
     def set_log_appender(self, log_appender):
-        self.log_appender = log_appender
+        self.appenders = [(log_appender, 0)]
+        self._notify()
+    
+    def add_log_appender(self, log_appender, log_level=None):
+        self.appenders.append((log_appender, log_level.value if log_level else 0))
+        self._notify()
+    
+    def remove_log_appender(self, log_appender):
+        self.appenders = [entry for entry in self.appenders if entry[0] is not log_appender]
+        self._notify()
+    
+    def get_log_appenders(self):
+        return [appender for appender, _ in self.appenders]
+    
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+    
+    def _notify(self):
+        for listener in self.listeners:
+            listener()
+
+# logging_benchmark.py
+import contextlib
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from threading import Barrier, Thread
+from async_appender import AsyncAppender
+from console_appender import ConsoleAppender
+from file_appender import FileAppender
+from logger import Logger
+from logger_config import LoggerConfig
+from log_level import LogLevel
+from sqlite_appender import SQLiteAppender
+
+class LoggingBenchmark:
+    TOTAL_MESSAGES = 48000
+    THREAD_COUNTS = (1, 4, 16)
+    LINE_PATTERN = re.compile(r"^\[LogLevel\.INFO\] \d+ - worker (\d+) message (\d+)$")
+
+    @staticmethod
+    def make_appenders(directory):
+        console_path = os.path.join(directory, "console.log")
+        file_path = os.path.join(directory, "file.log")
+        async_path = os.path.join(directory, "async.log")
+        db_path = os.path.join(directory, "logs.db")
+        return (
+            ("console", ConsoleAppender, lambda: LoggingBenchmark.read_lines(console_path), console_path),
+            ("file", lambda: FileAppender(file_path), lambda: LoggingBenchmark.read_lines(file_path), file_path),
+            ("sqlite", lambda: SQLiteAppender(db_path), lambda: LoggingBenchmark.read_rows(db_path), db_path),
+            ("async file", lambda: AsyncAppender(FileAppender(async_path)),
+             lambda: LoggingBenchmark.read_lines(async_path), async_path),
+        )
+
+    @staticmethod
+    def read_lines(path):
+        with open(path, encoding="utf-8", errors="replace") as file:
+            return file.read().splitlines()
+
+    @staticmethod
+    def read_rows(path):
+        connection = sqlite3.connect(path)
+        rows = connection.execute("SELECT level, timestamp, message FROM logs").fetchall()
+        connection.close()
+        return [f"[LogLevel.{level}] {timestamp} - {message}" for level, timestamp, message in rows]
+
+    @staticmethod
+    def check_output(lines, expected):
+        seen = set()
+        interleaved = 0
+        for line in lines:
+            match = LoggingBenchmark.LINE_PATTERN.match(line)
+            if match:
+                seen.add((int(match.group(1)), int(match.group(2))))
+            elif line:
+                interleaved += 1
+        return len(expected - seen), interleaved
+
+    @staticmethod
+    def worker(logger, worker_id, count, barrier, latencies):
+        barrier.wait()
+        for i in range(count):
+            start = time.perf_counter_ns()
+            logger.info("worker %d message %d", worker_id, i)
+            latencies.append(time.perf_counter_ns() - start)
+
+    @staticmethod
+    def run_case(logger, appender, num_threads):
+        per_thread = LoggingBenchmark.TOTAL_MESSAGES // num_threads
+        logger.set_config(LoggerConfig(LogLevel.INFO, appender))
+        barrier = Barrier(num_threads + 1)
+        latencies = [[] for _ in range(num_threads)]
+        threads = [Thread(target=LoggingBenchmark.worker, args=(logger, n, per_thread, barrier, latencies[n]))
+                   for n in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        # Throughput includes draining whatever the appender still buffers
+        appender.close()
+        elapsed = time.perf_counter() - start
+        samples = sorted(sample for thread_latencies in latencies for sample in thread_latencies)
+        expected = {(n, i) for n in range(num_threads) for i in range(per_thread)}
+        return len(samples) / elapsed, samples[len(samples) // 2], samples[int(len(samples) * 0.99)], expected
+
+    @staticmethod
+    def run():
+        logger = Logger.get_logger("benchmark")
+        logger.set_propagate(False)
+        print(f"{'appender':>12} {'threads':>8} {'msgs/s':>10} {'p50 us':>8} {'p99 us':>8} {'lost':>6} {'interleaved':>12}")
+        for num_threads in LoggingBenchmark.THREAD_COUNTS:
+            with tempfile.TemporaryDirectory() as directory:
+                for name, make_appender, read_output, path in LoggingBenchmark.make_appenders(directory):
+                    if name == "console":
+                        with open(path, "w", encoding="utf-8") as console, contextlib.redirect_stdout(console):
+                            result = LoggingBenchmark.run_case(logger, make_appender(), num_threads)
+                    else:
+                        result = LoggingBenchmark.run_case(logger, make_appender(), num_threads)
+                    rate, p50, p99, expected = result
+                    lost, interleaved = LoggingBenchmark.check_output(read_output(), expected)
+                    print(f"{name:>12} {num_threads:>8} {rate:>10,.0f} {p50 / 1000:>8.1f} {p99 / 1000:>8.1f} "
+                          f"{lost:>6} {interleaved:>12}")
+
+if __name__ == "__main__":
+    LoggingBenchmark.run()
 
 # logging_framework_demo.py
 from logger import Logger
 from logger_config import LoggerConfig
 from log_level import LogLevel
 from file_appender import FileAppender
+from async_appender import AsyncAppender
+from console_appender import ConsoleAppender
 
 class LoggingFrameworkDemo:
     @staticmethod
@@ -157,12 +887,147 @@ class LoggingFrameworkDemo:
         logger.error("This is an error message")
         
         # Changing log level and appender
-        config = LoggerConfig(LogLevel.DEBUG, FileAppender("app.log"))
+        file_appender = FileAppender("app.log")
+        config = LoggerConfig(LogLevel.DEBUG, file_appender)
         logger.set_config(config)
         
         logger.debug("This is a debug message")
         logger.info("This is an information message")
 
+        # Writing to the file from a background thread
+        async_appender = AsyncAppender(file_appender)
+        logger.set_config(LoggerConfig(LogLevel.DEBUG, async_appender))
+
+        logger.debug("This is a debug message written asynchronously")
+
+        # Module loggers send their records to their own appenders and to the root's
+        payment_logger = Logger.get_logger("orders.payment")
+        payment_logger.set_config(LoggerConfig(LogLevel.DEBUG, ConsoleAppender(), LogLevel.WARNING))
+        payment_logger.warning("Payment %s declined", "#42")
+
+        async_appender.close()
+
 if __name__ == "__main__":
     LoggingFrameworkDemo.run()
 
+# overflow_policy.py
+from enum import Enum
+
+class OverflowPolicy(Enum):
+    BLOCK = 1
+    DROP_OLDEST = 2
+    DROP_DEBUG_FIRST = 3
+
+# pooled_database_appender.py
+import atexit
+from abc import abstractmethod
+from threading import Event, Lock, Thread
+from connection_pool import ConnectionPool
+from log_appender import LogAppender
+
+class PooledDatabaseAppender(LogAppender):
+    # Driver-specific subclasses supply the connection, the insert statement and their driver's error types
+    errors = ()
+    
+    def __init__(self, batch_size=500, flush_interval=1.0, pool_size=4):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pool = ConnectionPool(self._connect, pool_size)
+        self.buffer = []
+        self.lock = Lock()
+        self.stopped = Event()
+        self.flusher = Thread(target=self._flush_periodically, daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
+    
+    def append(self, log_message):
+        with self.lock:
+            self.buffer.append(self._to_row(log_message))
+            if len(self.buffer) < self.batch_size:
+                return
+            rows, self.buffer = self.buffer, []
+        self._write(rows)
+    
+    def append_batch(self, log_messages):
+        with self.lock:
+            self.buffer.extend(self._to_row(log_message) for log_message in log_messages)
+            if len(self.buffer) < self.batch_size:
+                return
+            rows, self.buffer = self.buffer, []
+        self._write(rows)
+    
+    def flush(self):
+        with self.lock:
+            rows, self.buffer = self.buffer, []
+        if rows:
+            self._write(rows)
+    
+    def close(self):
+        self.stopped.set()
+        self.flusher.join()
+        self.flush()
+        self.pool.close()
+        atexit.unregister(self.close)
+    
+    @abstractmethod
+    def _connect(self):
+        pass
+    
+    @abstractmethod
+    def _insert_rows(self, cursor, rows):
+        pass
+    
+    def _to_row(self, log_message):
+        return (log_message.get_level().name, log_message.get_message(), log_message.get_timestamp())
+    
+    def _write(self, rows):
+        try:
+            connection = self.pool.acquire()
+        except self.errors as e:
+            print(f"Error: {e}")
+            return
+        healthy = False
+        try:
+            cursor = connection.cursor()
+            self._insert_rows(cursor, rows)
+            connection.commit()
+            cursor.close()
+        except self.errors as e:
+            print(f"Error: {e}")
+        else:
+            healthy = True
+        finally:
+            # A connection that failed for any reason may be broken, so it is discarded rather than returned
+            if healthy:
+                self.pool.release(connection)
+            else:
+                self.pool.discard(connection)
+    
+    def _flush_periodically(self):
+        while not self.stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error: {e}")
+
+# sqlite_appender.py
+import sqlite3
+from pooled_database_appender import PooledDatabaseAppender
+
+class SQLiteAppender(PooledDatabaseAppender):
+    errors = (sqlite3.Error,)
+
+    def __init__(self, db_path, **options):
+        self.db_path = db_path
+        connection = sqlite3.connect(db_path)
+        connection.execute("CREATE TABLE IF NOT EXISTS logs (level TEXT, message TEXT, timestamp INTEGER)")
+        connection.commit()
+        connection.close()
+        super().__init__(**options)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, check_same_thread=False)
+
+    def _insert_rows(self, cursor, rows):
+        cursor.executemany("INSERT INTO logs (level, message, timestamp) VALUES (?, ?, ?)", rows)
+
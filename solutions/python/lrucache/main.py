@@ -1,54 +1,698 @@
-# lru_cache.py
-from node import Node
+# cache_stats.py
+from latency_histogram import LatencyHistogram
 
-class LRUCache:
+class CacheStats:
+    OPERATIONS = ("get", "get_many", "put", "put_many")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.load_successes = 0
+        self.load_failures = 0
+        self.total_load_time_ns = 0
+        self.latencies = {operation: LatencyHistogram() for operation in self.OPERATIONS}
+
+    def merge(self, other):
+        self.hits += other.hits
+        self.misses += other.misses
+        self.evictions += other.evictions
+        self.expirations += other.expirations
+        self.load_successes += other.load_successes
+        self.load_failures += other.load_failures
+        self.total_load_time_ns += other.total_load_time_ns
+        for operation, histogram in other.latencies.items():
+            self.latencies[operation].merge(histogram)
+
+    def snapshot(self, size, weight):
+        requests = self.hits + self.misses
+        loads = self.load_successes + self.load_failures
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "load_successes": self.load_successes,
+            "load_failures": self.load_failures,
+            "average_load_time_ns": self.total_load_time_ns / loads if loads else 0,
+            "size": size,
+            "weight": weight,
+            "latencies": {operation: histogram.snapshot() for operation, histogram in self.latencies.items()},
+        }
+
+# compact_lru_cache.py
+from array import array
+from threading import Lock
+
+class CompactLRUCache:
     def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
         self.capacity = capacity
-        self.cache = {}
+        self.slots = {}
+        self.keys = [None] * capacity
+        self.values = [None] * capacity
+        # Slot `capacity` is a single sentinel: next[sentinel] is the head, prev[sentinel] the tail
+        self.sentinel = capacity
+        self.prev = array("i", [capacity]) * (capacity + 1)
+        self.next = array("i", [capacity]) * (capacity + 1)
+        self.free_slots = array("i", range(capacity - 1, -1, -1))
+        self.lock = Lock()
+
+    def get(self, key):
+        with self.lock:
+            slot = self.slots.get(key)
+            if slot is None:
+                return None
+            self._move_to_head(slot)
+            return self.values[slot]
+
+    def put(self, key, value):
+        with self.lock:
+            slot = self.slots.get(key)
+            if slot is not None:
+                self.values[slot] = value
+                self._move_to_head(slot)
+                return
+            if not self.free_slots:
+                self._free_slot(self.prev[self.sentinel])
+            slot = self.free_slots.pop()
+            self.keys[slot] = key
+            self.values[slot] = value
+            self.slots[key] = slot
+            self._add_to_head(slot)
+
+    def remove(self, key):
+        with self.lock:
+            slot = self.slots.get(key)
+            if slot is None:
+                return None
+            value = self.values[slot]
+            self._free_slot(slot)
+            return value
+
+    def size(self):
+        with self.lock:
+            return len(self.slots)
+
+    def _free_slot(self, slot):
+        self._remove_slot(slot)
+        del self.slots[self.keys[slot]]
+        self.keys[slot] = None
+        self.values[slot] = None
+        self.free_slots.append(slot)
+
+    def _add_to_head(self, slot):
+        head = self.next[self.sentinel]
+        self.prev[slot] = self.sentinel
+        self.next[slot] = head
+        self.prev[head] = slot
+        self.next[self.sentinel] = slot
+
+    def _remove_slot(self, slot):
+        prev_slot = self.prev[slot]
+        next_slot = self.next[slot]
+        self.next[prev_slot] = next_slot
+        self.prev[next_slot] = prev_slot
+
+    def _move_to_head(self, slot):
+        self._remove_slot(slot)
+        self._add_to_head(slot)
+
+# count_min_sketch.py
+class CountMinSketch:
+    DEPTH = 4
+    MAX_COUNT = 15
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    MASK_64 = (1 << 64) - 1
+
+    def __init__(self, capacity):
+        # Several counters per cached entry keep collisions from inflating cold keys
+        width = 16
+        while width < 8 * capacity:
+            width <<= 1
+        self.width = width
+        self.mask = width - 1
+        self.table = bytearray(width * self.DEPTH)
+        # Counters are halved after this many increments so old popularity fades out
+        self.sample_size = 10 * width
+        self.additions = 0
+
+    def _indexes(self, key):
+        h = hash(key) & self.MASK_64
+        for row, seed in enumerate(self.SEEDS):
+            yield row * self.width + ((((h ^ seed) * seed) & self.MASK_64) >> 32 & self.mask)
+
+    def frequency(self, key):
+        table = self.table
+        return min(table[index] for index in self._indexes(key))
+
+    def increment(self, key):
+        table = self.table
+        incremented = False
+        for index in self._indexes(key):
+            if table[index] < self.MAX_COUNT:
+                table[index] += 1
+                incremented = True
+        if incremented:
+            self.additions += 1
+            if self.additions >= self.sample_size:
+                self._reset()
+
+    def _reset(self):
+        self.table = bytearray(count >> 1 for count in self.table)
+        self.additions //= 2
+
+# doubly_linked_list.py
+from node import Node
+
+class DoublyLinkedList:
+    def __init__(self):
         self.head = Node(None, None)
         self.tail = Node(None, None)
         self.head.next = self.tail
         self.tail.prev = self.head
+        self.weight = 0
 
-    def get(self, key):
-        if key in self.cache:
-            node = self.cache[key]
-            self._move_to_head(node)
-            return node.value
-        return None
+    def is_empty(self):
+        return self.head.next is self.tail
 
-    def put(self, key, value):
-        if key in self.cache:
-            node = self.cache[key]
-            node.value = value
-            self._move_to_head(node)
-        else:
-            node = Node(key, value)
-            self.cache[key] = node
-            self._add_to_head(node)
-            if len(self.cache) > self.capacity:
-                removed_node = self._remove_tail()
-                del self.cache[removed_node.key]
+    def peek_tail(self):
+        node = self.tail.prev
+        return None if node is self.head else node
 
-    def _add_to_head(self, node):
+    def add_to_head(self, node):
         node.prev = self.head
         node.next = self.head.next
         self.head.next.prev = node
         self.head.next = node
+        node.segment = self
+        self.weight += node.weight
 
-    def _remove_node(self, node):
+    def remove_node(self, node):
         node.prev.next = node.next
         node.next.prev = node.prev
+        node.segment = None
+        self.weight -= node.weight
 
-    def _move_to_head(self, node):
-        self._remove_node(node)
-        self._add_to_head(node)
+    def move_to_head(self, node):
+        self.remove_node(node)
+        self.add_to_head(node)
 
-    def _remove_tail(self):
-        node = self.tail.prev
-        self._remove_node(node)
+# eviction_policy.py
+from abc import ABC, abstractmethod
+
+class EvictionPolicy(ABC):
+    @abstractmethod
+    def record_insert(self, node):
+        pass
+
+    @abstractmethod
+    def record_access(self, node):
+        pass
+
+    @abstractmethod
+    def record_remove(self, node):
+        pass
+
+    @abstractmethod
+    def select_victim(self):
+        pass
+
+    def record_update(self, node, old_weight):
+        if node.segment is not None:
+            node.segment.weight += node.weight - old_weight
+        self.record_access(node)
+
+    def record_miss(self, key):
+        pass
+
+# eviction_policy_benchmark.py
+import itertools
+import random
+from lru_cache import LRUCache
+from lru_policy import LRUPolicy
+from slru_policy import SLRUPolicy
+from tiny_lfu_policy import TinyLFUPolicy
+
+class EvictionPolicyBenchmark:
+    CAPACITY = 1000
+    KEY_SPACE = 100000
+    TRACE_LENGTH = 200000
+    ZIPF_EXPONENT = 0.9
+    SCAN_EVERY = 20000
+    SCAN_LENGTH = 5000
+    POLICIES = (("LRU", LRUPolicy), ("SLRU", SLRUPolicy), ("W-TinyLFU", TinyLFUPolicy))
+
+    @staticmethod
+    def zipfian_trace(seed):
+        rng = random.Random(seed)
+        weights = [1 / (rank + 1) ** EvictionPolicyBenchmark.ZIPF_EXPONENT
+                   for rank in range(EvictionPolicyBenchmark.KEY_SPACE)]
+        cum_weights = list(itertools.accumulate(weights))
+        return rng.choices(range(EvictionPolicyBenchmark.KEY_SPACE), cum_weights=cum_weights,
+                           k=EvictionPolicyBenchmark.TRACE_LENGTH)
+
+    @staticmethod
+    def scan_mixed_trace(seed):
+        trace = []
+        cold_keys = itertools.count(EvictionPolicyBenchmark.KEY_SPACE)
+        for position, key in enumerate(EvictionPolicyBenchmark.zipfian_trace(seed)):
+            # Periodic one-off scans over keys that are never requested again
+            if position % EvictionPolicyBenchmark.SCAN_EVERY == 0:
+                trace.extend(itertools.islice(cold_keys, EvictionPolicyBenchmark.SCAN_LENGTH))
+            trace.append(key)
+        return trace
+
+    @staticmethod
+    def hit_ratio(policy, trace):
+        cache = LRUCache(EvictionPolicyBenchmark.CAPACITY, policy=policy)
+        hits = 0
+        for key in trace:
+            if cache.get(key) is None:
+                cache.put(key, key)
+            else:
+                hits += 1
+        return hits / len(trace)
+
+    @staticmethod
+    def run():
+        workloads = (("zipfian", EvictionPolicyBenchmark.zipfian_trace(42)),
+                     ("scan-mixed", EvictionPolicyBenchmark.scan_mixed_trace(42)))
+        print(f"{'workload':>12}" + "".join(f"{name:>12}" for name, _ in EvictionPolicyBenchmark.POLICIES))
+        for workload, trace in workloads:
+            ratios = [EvictionPolicyBenchmark.hit_ratio(policy, trace) for _, policy in EvictionPolicyBenchmark.POLICIES]
+            print(f"{workload:>12}" + "".join(f"{ratio:>12.2%}" for ratio in ratios))
+
+if __name__ == "__main__":
+    EvictionPolicyBenchmark.run()
+
+# expiry_sweeper.py
+from threading import Event, Thread
+
+class ExpirySweeper:
+    def __init__(self, cache, interval=1.0, batch_size=100):
+        self.cache = cache
+        self.interval = interval
+        self.batch_size = batch_size
+        self.stopped = Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            # Sweep in small batches so readers can take the lock between them
+            while self.cache.sweep_expired(self.batch_size) >= self.batch_size:
+                if self.stopped.is_set():
+                    return
+
+# latency_histogram.py
+class LatencyHistogram:
+    # Nanosecond latencies fit in 63 bits, so bit_length() is always a valid bucket index
+    NUM_BUCKETS = 64
+
+    def __init__(self):
+        # Bucket i counts samples in [2 ** (i - 1), 2 ** i) nanoseconds
+        self.buckets = [0] * self.NUM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, latency_ns):
+        self.buckets[latency_ns.bit_length()] += 1
+        self.count += 1
+        self.total_ns += latency_ns
+        if latency_ns > self.max_ns:
+            self.max_ns = latency_ns
+
+    def merge(self, other):
+        for i, bucket_count in enumerate(other.buckets):
+            self.buckets[i] += bucket_count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, percent):
+        if self.count == 0:
+            return 0
+        threshold = self.count * percent / 100
+        seen = 0
+        for i, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= threshold:
+                return min(1 << i, self.max_ns)
+        return self.max_ns
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ns": self.total_ns / self.count if self.count else 0,
+            "p50_ns": self.percentile(50),
+            "p90_ns": self.percentile(90),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max_ns,
+        }
+
+# lru_cache.py
+import asyncio
+import heapq
+import itertools
+import time
+from concurrent.futures import Future
+from threading import Lock
+from cache_stats import CacheStats
+from lru_policy import LRUPolicy
+from node import Node
+
+class LRUCache:
+    # Handed to waiters when the loading caller was cancelled or interrupted, telling them to retry the load
+    ABANDONED = object()
+
+    def __init__(self, capacity, weigher=None, default_ttl=None, clock=time.monotonic, policy=LRUPolicy,
+                 record_stats=False):
+        self.capacity = capacity
+        self.weigher = weigher
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.cache = {}
+        self.total_weight = 0
+        self.expiry_heap = []
+        self.expiry_counter = itertools.count()
+        self.policy = policy(capacity)
+        self.loading = {}
+        # Stats are None when disabled so every hook costs a single identity check
+        self.stats = CacheStats() if record_stats else None
+        self.lock = Lock()
+
+    def get(self, key):
+        stats = self.stats
+        start = time.perf_counter_ns() if stats is not None else 0
+        with self.lock:
+            node = self._lookup(key)
+            if stats is not None:
+                stats.latencies["get"].record(time.perf_counter_ns() - start)
+            return node.value if node is not None else None
+
+    def get_many(self, keys):
+        stats = self.stats
+        start = time.perf_counter_ns() if stats is not None else 0
+        found = {}
+        with self.lock:
+            for key in keys:
+                node = self._lookup(key)
+                if node is not None:
+                    found[key] = node.value
+            if stats is not None:
+                stats.latencies["get_many"].record(time.perf_counter_ns() - start)
+        return found
+
+    def put(self, key, value, ttl=None):
+        stats = self.stats
+        start = time.perf_counter_ns() if stats is not None else 0
+        weight, expires_at = self._prepare(key, value, ttl)
+        with self.lock:
+            self._store(key, value, weight, expires_at)
+            if stats is not None:
+                stats.latencies["put"].record(time.perf_counter_ns() - start)
+
+    def put_many(self, items, ttl=None):
+        stats = self.stats
+        start = time.perf_counter_ns() if stats is not None else 0
+        if isinstance(items, dict):
+            items = items.items()
+        prepared = [(key, value) + self._prepare(key, value, ttl) for key, value in items]
+        with self.lock:
+            for key, value, weight, expires_at in prepared:
+                self._store(key, value, weight, expires_at)
+            if stats is not None:
+                stats.latencies["put_many"].record(time.perf_counter_ns() - start)
+
+    def get_or_load(self, key, loader, ttl=None):
+        while True:
+            value, future, is_owner = self._begin_load(key)
+            if future is None:
+                return value
+            if is_owner:
+                break
+            value = future.result()
+            if value is not LRUCache.ABANDONED:
+                return value
+        start = time.perf_counter_ns()
+        try:
+            value = loader(key)
+        except BaseException as e:
+            self._fail_load(key, future, e, time.perf_counter_ns() - start)
+            raise
+        self._finish_load(key, future, value, ttl, time.perf_counter_ns() - start)
+        return value
+
+    async def get_or_load_async(self, key, loader, ttl=None):
+        while True:
+            value, future, is_owner = self._begin_load(key)
+            if future is None:
+                return value
+            if is_owner:
+                break
+            # Shielded so a cancelled waiter does not cancel the load shared with other callers
+            value = await asyncio.shield(asyncio.wrap_future(future))
+            if value is not LRUCache.ABANDONED:
+                return value
+        start = time.perf_counter_ns()
+        try:
+            value = await loader(key)
+        except BaseException as e:
+            self._fail_load(key, future, e, time.perf_counter_ns() - start)
+            raise
+        self._finish_load(key, future, value, ttl, time.perf_counter_ns() - start)
+        return value
+
+    def remove(self, key):
+        with self.lock:
+            node = self.cache.get(key)
+            if node is None:
+                return None
+            self._remove_entry(node)
+            return node.value
+
+    def sweep_expired(self, max_entries=100):
+        removed = 0
+        with self.lock:
+            now = self.clock()
+            heap = self.expiry_heap
+            for _ in range(max_entries):
+                if not heap or heap[0][0] > now:
+                    break
+                expires_at, _, node = heapq.heappop(heap)
+                # Entries that were overwritten or evicted leave stale heap items behind
+                if node.expires_at == expires_at and self.cache.get(node.key) is node:
+                    self._remove_entry(node)
+                    removed += 1
+            if self.stats is not None:
+                self.stats.expirations += removed
+        return removed
+
+    def size(self):
+        with self.lock:
+            return len(self.cache)
+
+    def weight(self):
+        with self.lock:
+            return self.total_weight
+
+    def set_record_stats(self, enabled):
+        with self.lock:
+            if not enabled:
+                self.stats = None
+            elif self.stats is None:
+                self.stats = CacheStats()
+
+    def stats_snapshot(self):
+        with self.lock:
+            if self.stats is None:
+                return None
+            return self.stats.snapshot(len(self.cache), self.total_weight)
+
+    def reset_stats(self):
+        with self.lock:
+            if self.stats is not None:
+                self.stats = CacheStats()
+
+    def _lookup(self, key):
+        node = self.cache.get(key)
+        if node is None:
+            self.policy.record_miss(key)
+            if self.stats is not None:
+                self.stats.misses += 1
+            return None
+        if node.expires_at is not None and node.expires_at <= self.clock():
+            self._remove_entry(node)
+            if self.stats is not None:
+                self.stats.expirations += 1
+                self.stats.misses += 1
+            return None
+        self.policy.record_access(node)
+        if self.stats is not None:
+            self.stats.hits += 1
         return node
 
+    def _prepare(self, key, value, ttl):
+        weight = self.weigher(key, value) if self.weigher else 1
+        if ttl is None:
+            ttl = self.default_ttl
+        expires_at = self.clock() + ttl if ttl is not None else None
+        return weight, expires_at
+
+    def _store(self, key, value, weight, expires_at):
+        node = self.cache.get(key)
+        if weight > self.capacity:
+            # An entry that can never fit would only flush the rest of the cache
+            if node is not None:
+                self._remove_entry(node)
+            return
+        if node is not None:
+            old_weight = node.weight
+            self.total_weight += weight - old_weight
+            node.value = value
+            node.weight = weight
+            node.expires_at = expires_at
+            self.policy.record_update(node, old_weight)
+        else:
+            node = Node(key, value, weight, expires_at)
+            self.cache[key] = node
+            self.total_weight += weight
+            self.policy.record_insert(node)
+        if expires_at is not None:
+            heapq.heappush(self.expiry_heap, (expires_at, next(self.expiry_counter), node))
+            if len(self.expiry_heap) > 2 * len(self.cache) + 64:
+                self._rebuild_expiry_heap()
+        while self.total_weight > self.capacity:
+            self._remove_entry(self.policy.select_victim())
+            if self.stats is not None:
+                self.stats.evictions += 1
+
+    def _begin_load(self, key):
+        with self.lock:
+            node = self._lookup(key)
+            if node is not None:
+                return node.value, None, False
+            # Concurrent misses on the same key wait for the first caller's load
+            future = self.loading.get(key)
+            if future is not None:
+                return None, future, False
+            future = Future()
+            self.loading[key] = future
+            return None, future, True
+
+    def _finish_load(self, key, future, value, ttl, load_time_ns):
+        weight, expires_at = self._prepare(key, value, ttl)
+        with self.lock:
+            self._store(key, value, weight, expires_at)
+            del self.loading[key]
+            if self.stats is not None:
+                self.stats.load_successes += 1
+                self.stats.total_load_time_ns += load_time_ns
+        future.set_result(value)
+
+    def _fail_load(self, key, future, error, load_time_ns):
+        with self.lock:
+            del self.loading[key]
+            if self.stats is not None:
+                self.stats.load_failures += 1
+                self.stats.total_load_time_ns += load_time_ns
+        # Only the loader's own errors are shared; a cancellation or interrupt belongs to the loading caller alone
+        if isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            future.set_result(LRUCache.ABANDONED)
+
+    def _remove_entry(self, node):
+        self.policy.record_remove(node)
+        del self.cache[node.key]
+        self.total_weight -= node.weight
+
+    def _rebuild_expiry_heap(self):
+        self.expiry_heap = [entry for entry in self.expiry_heap
+                            if entry[2].expires_at == entry[0] and self.cache.get(entry[2].key) is entry[2]]
+        heapq.heapify(self.expiry_heap)
+
+# lru_cache_benchmark.py
+import random
+import time
+from threading import Thread, Barrier
+from lru_cache import LRUCache
+from sharded_lru_cache import ShardedLRUCache
+
+class LRUCacheBenchmark:
+    CAPACITY = 10000
+    KEY_SPACE = 20000
+    OPS_PER_THREAD = 200000
+    GET_RATIO = 0.8
+
+    @staticmethod
+    def _make_ops(seed):
+        rng = random.Random(seed)
+        ops = []
+        for _ in range(LRUCacheBenchmark.OPS_PER_THREAD):
+            key = rng.randrange(LRUCacheBenchmark.KEY_SPACE)
+            ops.append((rng.random() < LRUCacheBenchmark.GET_RATIO, key))
+        return ops
+
+    @staticmethod
+    def _worker(cache, ops, barrier):
+        get = cache.get
+        put = cache.put
+        barrier.wait()
+        for is_get, key in ops:
+            if is_get:
+                get(key)
+            else:
+                put(key, key)
+
+    @staticmethod
+    def measure(cache, num_threads):
+        workloads = [LRUCacheBenchmark._make_ops(seed) for seed in range(num_threads)]
+        barrier = Barrier(num_threads + 1)
+        threads = [Thread(target=LRUCacheBenchmark._worker, args=(cache, ops, barrier)) for ops in workloads]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return num_threads * LRUCacheBenchmark.OPS_PER_THREAD / elapsed
+
+    @staticmethod
+    def run():
+        print(f"{'threads':>8} {'single-lock ops/s':>18} {'sharded ops/s':>15} {'speedup':>8}")
+        for num_threads in (1, 2, 4, 8, 16):
+            single = LRUCacheBenchmark.measure(LRUCache(LRUCacheBenchmark.CAPACITY), num_threads)
+            sharded = LRUCacheBenchmark.measure(ShardedLRUCache(LRUCacheBenchmark.CAPACITY, 16), num_threads)
+            print(f"{num_threads:>8} {single:>18,.0f} {sharded:>15,.0f} {sharded / single:>7.2f}x")
+
+        without_stats = LRUCacheBenchmark.measure(LRUCache(LRUCacheBenchmark.CAPACITY), 1)
+        stats_cache = LRUCache(LRUCacheBenchmark.CAPACITY, record_stats=True)
+        with_stats = LRUCacheBenchmark.measure(stats_cache, 1)
+        print(f"stats off: {without_stats:,.0f} ops/s, stats on: {with_stats:,.0f} ops/s")
+        snapshot = stats_cache.stats_snapshot()
+        print(f"hit rate {snapshot['hit_rate']:.2%}, evictions {snapshot['evictions']:,}, "
+              f"get p99 {snapshot['latencies']['get']['p99_ns']} ns, put p99 {snapshot['latencies']['put']['p99_ns']} ns")
+
+if __name__ == "__main__":
+    LRUCacheBenchmark.run()
+
 # lru_cache_demo.py
 from lru_cache import LRUCache
 
@@ -77,11 +721,233 @@ class LRUCacheDemo:
 if __name__ == "__main__":
     LRUCacheDemo.run()
 
+# lru_cache_memory_benchmark.py
+import gc
+import tracemalloc
+from lru_cache import LRUCache
+from compact_lru_cache import CompactLRUCache
+
+class LRUCacheMemoryBenchmark:
+    NUM_ENTRIES = 500000
+
+    @staticmethod
+    def measure(cache_class, keys):
+        gc.collect()
+        tracemalloc.start()
+        cache = cache_class(len(keys))
+        for key in keys:
+            cache.put(key, key)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert cache.size() == len(keys)
+        return current / len(keys)
+
+    @staticmethod
+    def run():
+        # Keys and values are allocated up front so only the cache's own bookkeeping is measured
+        keys = [f"key-{i}" for i in range(LRUCacheMemoryBenchmark.NUM_ENTRIES)]
+        print(f"{LRUCacheMemoryBenchmark.NUM_ENTRIES:,} entries")
+        for cache_class in (LRUCache, CompactLRUCache):
+            bytes_per_entry = LRUCacheMemoryBenchmark.measure(cache_class, keys)
+            print(f"{cache_class.__name__:>16}: {bytes_per_entry:6.1f} bytes/entry")
+
+if __name__ == "__main__":
+    LRUCacheMemoryBenchmark.run()
+
+# lru_policy.py
+from doubly_linked_list import DoublyLinkedList
+from eviction_policy import EvictionPolicy
+
+class LRUPolicy(EvictionPolicy):
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = DoublyLinkedList()
+
+    def record_insert(self, node):
+        self.entries.add_to_head(node)
+
+    def record_access(self, node):
+        self.entries.move_to_head(node)
+
+    def record_remove(self, node):
+        self.entries.remove_node(node)
+
+    def select_victim(self):
+        return self.entries.peek_tail()
+
 # node.py
 class Node:
-    def __init__(self, key, value):
+    __slots__ = ("key", "value", "prev", "next", "weight", "expires_at", "segment")
+
+    def __init__(self, key, value, weight=1, expires_at=None):
         self.key = key
         self.value = value
         self.prev = None
         self.next = None
+        self.weight = weight
+        self.expires_at = expires_at
+        self.segment = None
+
+# sharded_lru_cache.py
+from cache_stats import CacheStats
+from lru_cache import LRUCache
+
+class ShardedLRUCache:
+    def __init__(self, capacity, num_shards=16, **options):
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+        # Every shard needs room for at least one entry
+        num_shards = max(1, min(num_shards, capacity))
+        shard_capacity, remainder = divmod(capacity, num_shards)
+        self.capacity = capacity
+        self.num_shards = num_shards
+        self.shards = [LRUCache(shard_capacity + (1 if i < remainder else 0), **options) for i in range(num_shards)]
+
+    def _get_shard(self, key):
+        return self.shards[hash(key) % self.num_shards]
+
+    def _group_by_shard(self, entries, key=lambda entry: entry):
+        groups = {}
+        for entry in entries:
+            groups.setdefault(self._get_shard(key(entry)), []).append(entry)
+        return groups
+
+    def get(self, key):
+        return self._get_shard(key).get(key)
+
+    def get_many(self, keys):
+        found = {}
+        for shard, shard_keys in self._group_by_shard(keys).items():
+            found.update(shard.get_many(shard_keys))
+        return found
+
+    def put(self, key, value, ttl=None):
+        self._get_shard(key).put(key, value, ttl)
+
+    def put_many(self, items, ttl=None):
+        if isinstance(items, dict):
+            items = items.items()
+        for shard, shard_items in self._group_by_shard(items, key=lambda item: item[0]).items():
+            shard.put_many(shard_items, ttl)
+
+    def get_or_load(self, key, loader, ttl=None):
+        return self._get_shard(key).get_or_load(key, loader, ttl)
+
+    async def get_or_load_async(self, key, loader, ttl=None):
+        return await self._get_shard(key).get_or_load_async(key, loader, ttl)
+
+    def remove(self, key):
+        return self._get_shard(key).remove(key)
+
+    def sweep_expired(self, max_entries=100):
+        return sum(shard.sweep_expired(max_entries) for shard in self.shards)
+
+    def size(self):
+        return sum(shard.size() for shard in self.shards)
+
+    def set_record_stats(self, enabled):
+        for shard in self.shards:
+            shard.set_record_stats(enabled)
+
+    def stats_snapshot(self):
+        merged = CacheStats()
+        size = weight = 0
+        for shard in self.shards:
+            with shard.lock:
+                if shard.stats is None:
+                    return None
+                merged.merge(shard.stats)
+                size += len(shard.cache)
+                weight += shard.total_weight
+        return merged.snapshot(size, weight)
+
+    def reset_stats(self):
+        for shard in self.shards:
+            shard.reset_stats()
+
+# slru_policy.py
+from doubly_linked_list import DoublyLinkedList
+from eviction_policy import EvictionPolicy
+
+class SLRUPolicy(EvictionPolicy):
+    def __init__(self, capacity, protected_ratio=0.8):
+        self.capacity = capacity
+        self.protected_capacity = int(capacity * protected_ratio)
+        self.probation = DoublyLinkedList()
+        self.protected = DoublyLinkedList()
+
+    def record_insert(self, node):
+        self.probation.add_to_head(node)
+
+    def record_access(self, node):
+        if node.segment is self.protected:
+            self.protected.move_to_head(node)
+            return
+        # A second hit promotes the entry out of probation
+        self.probation.remove_node(node)
+        self.protected.add_to_head(node)
+        while self.protected.weight > self.protected_capacity:
+            demoted = self.protected.peek_tail()
+            self.protected.remove_node(demoted)
+            self.probation.add_to_head(demoted)
+
+    def record_remove(self, node):
+        node.segment.remove_node(node)
+
+    def select_victim(self):
+        victim = self.probation.peek_tail()
+        return victim if victim is not None else self.protected.peek_tail()
+
+    def weight(self):
+        return self.probation.weight + self.protected.weight
+
+# tiny_lfu_policy.py
+from count_min_sketch import CountMinSketch
+from doubly_linked_list import DoublyLinkedList
+from eviction_policy import EvictionPolicy
+from slru_policy import SLRUPolicy
+
+class TinyLFUPolicy(EvictionPolicy):
+    def __init__(self, capacity, window_ratio=0.01):
+        self.capacity = capacity
+        self.window_capacity = max(1, int(capacity * window_ratio))
+        self.window = DoublyLinkedList()
+        self.main = SLRUPolicy(capacity - self.window_capacity)
+        self.sketch = CountMinSketch(capacity)
+
+    def record_insert(self, node):
+        self.sketch.increment(node.key)
+        self.window.add_to_head(node)
+        # While the main space has room, window overflow moves there without a contest
+        while self.window.weight > self.window_capacity:
+            candidate = self.window.peek_tail()
+            if self.main.weight() + candidate.weight > self.main.capacity:
+                break
+            self.window.remove_node(candidate)
+            self.main.record_insert(candidate)
+
+    def record_access(self, node):
+        self.sketch.increment(node.key)
+        if node.segment is self.window:
+            self.window.move_to_head(node)
+        else:
+            self.main.record_access(node)
+
+    def record_miss(self, key):
+        self.sketch.increment(key)
+
+    def record_remove(self, node):
+        node.segment.remove_node(node)
+
+    def select_victim(self):
+        victim = self.main.select_victim()
+        if self.window.weight <= self.window_capacity or victim is None:
+            return victim if victim is not None else self.window.peek_tail()
+        # The window's LRU entry only enters the main space if it is more popular than what it replaces
+        candidate = self.window.peek_tail()
+        if self.sketch.frequency(candidate.key) > self.sketch.frequency(victim.key):
+            self.window.remove_node(candidate)
+            self.main.record_insert(candidate)
+            return victim
+        return candidate
 
@@ -1,3 +1,252 @@
+# async_pub_sub_benchmark.py
+import asyncio
+import time
+from threading import Event
+from async_pub_sub_system import AsyncPubSubSystem
+from message import Message
+from pub_sub_system import PubSubSystem
+
+class ThreadCountingSubscriber:
+    def __init__(self, expected):
+        self.expected = expected
+        self.received = 0
+        self.done = Event()
+
+    def on_message(self, message):
+        self.received += 1
+        if self.received >= self.expected:
+            self.done.set()
+
+class AsyncCountingSubscriber:
+    def __init__(self, expected):
+        self.expected = expected
+        self.received = 0
+        self.done = asyncio.Event()
+
+    async def on_message(self, message):
+        self.received += 1
+        if self.received >= self.expected:
+            self.done.set()
+
+class AsyncPubSubBenchmark:
+    NUM_MESSAGES = 100000
+    NUM_SUBSCRIBERS = 4
+
+    @staticmethod
+    def measure_threads(messages):
+        pub_sub_system = PubSubSystem()
+        pub_sub_system.create_topic("events")
+        subscribers = [ThreadCountingSubscriber(len(messages)) for _ in range(AsyncPubSubBenchmark.NUM_SUBSCRIBERS)]
+        for subscriber in subscribers:
+            pub_sub_system.subscribe("events", subscriber)
+        start = time.perf_counter()
+        for message in messages:
+            pub_sub_system.publish("events", message)
+        for subscriber in subscribers:
+            subscriber.done.wait()
+        elapsed = time.perf_counter() - start
+        pub_sub_system.shutdown()
+        return len(messages) / elapsed
+
+    @staticmethod
+    async def measure_async(messages):
+        pub_sub_system = AsyncPubSubSystem()
+        pub_sub_system.create_topic("events")
+        subscribers = [AsyncCountingSubscriber(len(messages)) for _ in range(AsyncPubSubBenchmark.NUM_SUBSCRIBERS)]
+        for subscriber in subscribers:
+            pub_sub_system.subscribe("events", subscriber)
+        start = time.perf_counter()
+        for message in messages:
+            await pub_sub_system.publish("events", message)
+        for subscriber in subscribers:
+            await subscriber.done.wait()
+        elapsed = time.perf_counter() - start
+        await pub_sub_system.shutdown()
+        return len(messages) / elapsed
+
+    @staticmethod
+    def run():
+        messages = [Message(i) for i in range(AsyncPubSubBenchmark.NUM_MESSAGES)]
+        print(f"{AsyncPubSubBenchmark.NUM_SUBSCRIBERS} subscribers, {len(messages):,} messages")
+        print(f"thread dispatchers: {AsyncPubSubBenchmark.measure_threads(messages):>12,.0f} messages/s")
+        print(f"   asyncio queues: {asyncio.run(AsyncPubSubBenchmark.measure_async(messages)):>12,.0f} messages/s")
+
+if __name__ == "__main__":
+    AsyncPubSubBenchmark.run()
+
+# async_pub_sub_system.py
+from async_topic import AsyncTopic
+from backpressure_policy import BackpressurePolicy
+
+class AsyncPubSubSystem:
+    def __init__(self, queue_capacity=1000, backpressure_policy=BackpressurePolicy.BLOCK, max_batch_size=1):
+        self.topics = {}
+        self.queue_capacity = queue_capacity
+        self.backpressure_policy = backpressure_policy
+        self.max_batch_size = max_batch_size
+
+    def create_topic(self, topic_name):
+        self.topics.setdefault(topic_name, AsyncTopic(topic_name))
+
+    def subscribe(self, topic_name, subscriber, queue_capacity=None, backpressure_policy=None, max_batch_size=None):
+        # Must be called from the event loop that will run the subscriber's dispatcher
+        topic = self.topics.get(topic_name)
+        if topic:
+            topic.add_subscriber(subscriber,
+                                 capacity=queue_capacity or self.queue_capacity,
+                                 policy=backpressure_policy or self.backpressure_policy,
+                                 max_batch_size=max_batch_size or self.max_batch_size)
+
+    async def unsubscribe(self, topic_name, subscriber):
+        topic = self.topics.get(topic_name)
+        if topic:
+            await topic.remove_subscriber(subscriber)
+
+    async def publish(self, topic_name, message):
+        topic = self.topics.get(topic_name)
+        if topic:
+            await topic.publish(message)
+
+    async def publish_batch(self, topic_name, messages):
+        topic = self.topics.get(topic_name)
+        if topic:
+            await topic.publish_batch(messages)
+
+    def get_subscriber_metrics(self, topic_name):
+        topic = self.topics.get(topic_name)
+        return topic.get_subscriber_metrics() if topic else {}
+
+    async def shutdown(self):
+        for topic in self.topics.values():
+            await topic.close()
+
+    def get_topics(self):
+        return self.topics
+
+# async_subscription.py
+import asyncio
+import inspect
+from backpressure_policy import BackpressurePolicy
+
+class AsyncSubscription:
+    _CLOSE = object()
+
+    def __init__(self, subscriber, capacity=1000, policy=BackpressurePolicy.BLOCK, max_batch_size=1):
+        self.subscriber = subscriber
+        self.policy = policy
+        self.max_batch_size = max_batch_size
+        self.batch_handler = getattr(subscriber, "on_messages", None)
+        self.queue = asyncio.Queue(maxsize=capacity)
+        self.enqueued_count = 0
+        self.delivered_count = 0
+        self.dropped_count = 0
+        self.closed = False
+        self.dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def enqueue(self, message):
+        if self.closed:
+            return False
+        if self.queue.full():
+            if self.policy == BackpressurePolicy.DROP_NEWEST:
+                self.dropped_count += 1
+                return False
+            if self.policy == BackpressurePolicy.DROP_OLDEST:
+                self.queue.get_nowait()
+                self.dropped_count += 1
+        await self.queue.put(message)
+        self.enqueued_count += 1
+        return True
+
+    async def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        # The marker queues behind pending messages, so they are delivered first
+        await self.queue.put(self._CLOSE)
+        await self.dispatcher
+
+    def get_metrics(self):
+        return {
+            "lag": self.queue.qsize(),
+            "enqueued": self.enqueued_count,
+            "delivered": self.delivered_count,
+            "dropped": self.dropped_count,
+        }
+
+    async def _deliver(self, batch):
+        try:
+            if self.batch_handler is not None:
+                result = self.batch_handler(batch)
+                if inspect.isawaitable(result):
+                    await result
+            else:
+                for message in batch:
+                    result = self.subscriber.on_message(message)
+                    if inspect.isawaitable(result):
+                        await result
+        except Exception as e:
+            print(f"Error delivering message: {e}")
+        self.delivered_count += len(batch)
+
+    async def _dispatch(self):
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            closing = batch[-1] is self._CLOSE
+            if closing:
+                batch.pop()
+            if batch:
+                await self._deliver(batch)
+            if closing:
+                return
+
+# async_topic.py
+from async_subscription import AsyncSubscription
+
+class AsyncTopic:
+    def __init__(self, name):
+        self.name = name
+        self.subscriptions = {}
+
+    def get_name(self):
+        return self.name
+
+    def add_subscriber(self, subscriber, **options):
+        if subscriber not in self.subscriptions:
+            self.subscriptions[subscriber] = AsyncSubscription(subscriber, **options)
+
+    async def remove_subscriber(self, subscriber):
+        subscription = self.subscriptions.pop(subscriber, None)
+        if subscription:
+            await subscription.close()
+
+    async def publish(self, message):
+        for subscription in list(self.subscriptions.values()):
+            await subscription.enqueue(message)
+
+    async def publish_batch(self, messages):
+        for subscription in list(self.subscriptions.values()):
+            for message in messages:
+                await subscription.enqueue(message)
+
+    def get_subscriber_metrics(self):
+        return {subscriber: subscription.get_metrics() for subscriber, subscription in self.subscriptions.items()}
+
+    async def close(self):
+        subscriptions = list(self.subscriptions.values())
+        self.subscriptions.clear()
+        for subscription in subscriptions:
+            await subscription.close()
+
+# backpressure_policy.py
+from enum import Enum
+
+class BackpressurePolicy(Enum):
+    BLOCK = 1
+    DROP_OLDEST = 2
+    DROP_NEWEST = 3
+
 # concrete_subscriber.py
 class ConcreteSubscriber:
     def __init__(self, name):
@@ -6,47 +255,872 @@ class ConcreteSubscriber:
     def on_message(self, message):
         print(f"Subscriber {self.name} received message: {message.get_content()}")
 
+# consumer_group.py
+from threading import Lock
+from group_delivery import GroupDelivery
+from group_member import BatchGroupMember, GroupMember
+from subscription import Subscription
+
+class ConsumerGroup:
+    def __init__(self, group_id, num_partitions, **options):
+        self.group_id = group_id
+        self.options = options
+        self.members = {}
+        # targets is where each partition should be consumed; owners is the member that last received its messages
+        self.targets = [None] * num_partitions
+        self.owners = [None] * num_partitions
+        # Messages handed to a member but not yet processed (or dropped) by it
+        self.outstanding = [0] * num_partitions
+        # Messages held while a partition has no member or is moving to a new one
+        self.pending = [[] for _ in range(num_partitions)]
+        self.handing_off = [False] * num_partitions
+        self.lock = Lock()
+
+    def get_group_id(self):
+        return self.group_id
+
+    def add_member(self, subscriber):
+        with self.lock:
+            if subscriber in self.members:
+                return
+            member_class = BatchGroupMember if hasattr(subscriber, "on_messages") else GroupMember
+            self.members[subscriber] = Subscription(member_class(self, subscriber), **self.options)
+            self._rebalance()
+        self._advance_all()
+
+    def remove_member(self, subscriber):
+        with self.lock:
+            subscription = self.members.pop(subscriber, None)
+            if subscription is None:
+                return
+            self._rebalance()
+        self._advance_all()
+        # The leaving member still processes what it already holds; its partitions move once that is acknowledged
+        subscription.close()
+
+    def get_assignments(self):
+        with self.lock:
+            return [subscription.subscriber.subscriber if subscription else None for subscription in self.targets]
+
+    def enqueue(self, partition, message):
+        self.enqueue_batch(partition, [message])
+
+    def enqueue_batch(self, partition, messages):
+        messages = [GroupDelivery(partition, message) for message in messages]
+        with self.lock:
+            owner = self.owners[partition]
+            if owner is None or owner is not self.targets[partition] or self.handing_off[partition] \
+                    or self.pending[partition]:
+                self.pending[partition].extend(messages)
+                return
+            self.outstanding[partition] += len(messages)
+        accepted = owner.enqueue_batch(messages)
+        if accepted < len(messages):
+            self._release(partition, len(messages) - accepted)
+
+    def acknowledge(self, deliveries):
+        counts = {}
+        for delivery in deliveries:
+            counts[delivery.partition] = counts.get(delivery.partition, 0) + 1
+        for partition, count in counts.items():
+            self._release(partition, count)
+
+    def get_lag(self):
+        with self.lock:
+            members = list(self.members.values())
+            pending = sum(len(messages) for messages in self.pending)
+        return pending + sum(subscription.get_lag() for subscription in members)
+
+    def get_metrics(self):
+        with self.lock:
+            members = dict(self.members)
+            partitions = {}
+            for partition, subscription in enumerate(self.targets):
+                if subscription is not None:
+                    partitions.setdefault(subscription, []).append(partition)
+            pending = sum(len(messages) for messages in self.pending)
+        metrics = {subscriber: dict(subscription.get_metrics(), partitions=partitions.get(subscription, []))
+                   for subscriber, subscription in members.items()}
+        return {"members": metrics, "pending": pending}
+
+    def close(self):
+        with self.lock:
+            members = list(self.members.values())
+            self.members.clear()
+            self.targets = [None] * len(self.targets)
+        for subscription in members:
+            subscription.close()
+
+    def _rebalance(self):
+        # Partition p goes to member p % n, so each partition, and every key hashed to it, has one ordered consumer
+        members = list(self.members.values())
+        for partition in range(len(self.targets)):
+            self.targets[partition] = members[partition % len(members)] if members else None
+
+    def _release(self, partition, count):
+        with self.lock:
+            self.outstanding[partition] -= count
+            drained = self.outstanding[partition] == 0
+        if drained:
+            self._advance(partition)
+
+    def _advance_all(self):
+        for partition in range(len(self.targets)):
+            self._advance(partition)
+
+    def _advance(self, partition):
+        # Moves a partition to its target only after the previous owner acknowledged everything it was given,
+        # then hands over the held messages ahead of anything published later
+        while True:
+            with self.lock:
+                target = self.targets[partition]
+                if self.handing_off[partition] or target is None:
+                    return
+                if self.owners[partition] is not target and self.outstanding[partition] > 0:
+                    return
+                self.owners[partition] = target
+                if not self.pending[partition]:
+                    return
+                messages, self.pending[partition] = self.pending[partition], []
+                self.outstanding[partition] += len(messages)
+                self.handing_off[partition] = True
+            # Never waits for room: the caller may be another member's dispatcher handing off in the opposite
+            # direction, and the held messages were already admitted by the publisher
+            accepted = target.enqueue_batch(messages, block=False)
+            with self.lock:
+                self.handing_off[partition] = False
+                self.outstanding[partition] -= len(messages) - accepted
+
+# consumer_group_benchmark.py
+import time
+from threading import Event, Lock
+from message import Message
+from pub_sub_system import PubSubSystem
+
+class SlowConsumer:
+    lock = Lock()
+
+    def __init__(self, state):
+        self.state = state
+
+    def on_message(self, message):
+        key, sequence = message.get_content()
+        with SlowConsumer.lock:
+            # Another member still working on the same key means the partition had two owners at once
+            if key in self.state["active"]:
+                self.state["overlapping"] += 1
+            self.state["active"].add(key)
+        # Simulates roughly a millisecond of I/O-bound work per message
+        time.sleep(0.001)
+        with SlowConsumer.lock:
+            self.state["active"].discard(key)
+            if sequence <= self.state["last"].get(key, -1):
+                self.state["out_of_order"] += 1
+            self.state["last"][key] = sequence
+            self.state["received"] += 1
+            if self.state["received"] >= self.state["expected"]:
+                self.state["done"].set()
+
+class ConsumerGroupBenchmark:
+    NUM_MESSAGES = 2000
+    NUM_PARTITIONS = 8
+    NUM_KEYS = 64
+
+    @staticmethod
+    def measure(initial_members, membership_changes=(), queue_capacity=NUM_MESSAGES):
+        # membership_changes maps a message index to the number of members to add (positive) or remove (negative)
+        pub_sub_system = PubSubSystem(queue_capacity=queue_capacity)
+        pub_sub_system.create_topic("orders", num_partitions=ConsumerGroupBenchmark.NUM_PARTITIONS)
+        state = {"last": {}, "active": set(), "out_of_order": 0, "overlapping": 0, "received": 0,
+                 "expected": ConsumerGroupBenchmark.NUM_MESSAGES, "done": Event()}
+        members = []
+
+        def join():
+            member = SlowConsumer(state)
+            members.append(member)
+            pub_sub_system.subscribe("orders", member, group_id="billing")
+
+        for _ in range(initial_members):
+            join()
+        changes = dict(membership_changes)
+        start = time.perf_counter()
+        for i in range(ConsumerGroupBenchmark.NUM_MESSAGES):
+            for _ in range(max(changes.get(i, 0), 0)):
+                join()
+            for _ in range(max(-changes.get(i, 0), 0)):
+                pub_sub_system.unsubscribe("orders", members.pop(0), group_id="billing")
+            key = f"customer-{i % ConsumerGroupBenchmark.NUM_KEYS}"
+            pub_sub_system.publish("orders", Message((key, i), key=key))
+            if changes and queue_capacity >= ConsumerGroupBenchmark.NUM_MESSAGES:
+                # Paces the publisher so membership changes land while members still hold queued work;
+                # small queues already hold the publisher back
+                time.sleep(0.0002)
+        state["done"].wait()
+        elapsed = time.perf_counter() - start
+        pub_sub_system.shutdown()
+        return ConsumerGroupBenchmark.NUM_MESSAGES / elapsed, state["out_of_order"], state["overlapping"]
+
+    @staticmethod
+    def run():
+        print(f"{ConsumerGroupBenchmark.NUM_MESSAGES} keyed messages, {ConsumerGroupBenchmark.NUM_PARTITIONS} partitions, "
+              f"~1 ms per message")
+        baseline = None
+        for group_size in (1, 2, 4, 8):
+            throughput, out_of_order, overlapping = ConsumerGroupBenchmark.measure(group_size)
+            baseline = baseline or throughput
+            print(f"{group_size} consumer(s): {throughput:,.0f} msg/s ({throughput / baseline:.1f}x), "
+                  f"out-of-order per key: {out_of_order}, overlapping per key: {overlapping}")
+
+        # Members join and leave while earlier members still have queued messages for the partitions that move
+        quarter = ConsumerGroupBenchmark.NUM_MESSAGES // 4
+        throughput, out_of_order, overlapping = ConsumerGroupBenchmark.measure(
+            1, {quarter: 1, 2 * quarter: 2, 3 * quarter: -2, 3 * quarter + quarter // 2: 3})
+        print(f"joins and leaves mid-stream: {throughput:,.0f} msg/s, out-of-order per key: {out_of_order}, "
+              f"overlapping per key: {overlapping}")
+
+        # With tiny queues, partitions moving in both directions at once must not leave two dispatchers
+        # waiting on each other's full queues
+        churn = {i: 1 if i // 100 % 2 == 0 else -1 for i in range(50, ConsumerGroupBenchmark.NUM_MESSAGES, 100)}
+        throughput, out_of_order, overlapping = ConsumerGroupBenchmark.measure(2, churn, queue_capacity=4)
+        print(f"a join or leave every 100 messages, queue capacity 4: {throughput:,.0f} msg/s, "
+              f"out-of-order per key: {out_of_order}, overlapping per key: {overlapping}")
+
+if __name__ == "__main__":
+    ConsumerGroupBenchmark.run()
+
+# durable_log.py
+import json
+import os
+import time
+from threading import Event, Lock, Thread
+from fsync_policy import FsyncPolicy
+from log_segment import LogSegment
+
+class DurableLog:
+    def __init__(self, directory, segment_bytes=64 * 1024 * 1024, fsync_policy=FsyncPolicy.INTERVAL, fsync_interval=1.0,
+                 retention_bytes=None, retention_seconds=None, serializer=None, deserializer=None):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+        self.serializer = serializer or (lambda content: json.dumps(content).encode("utf-8"))
+        self.deserializer = deserializer or (lambda payload: json.loads(payload))
+        self.last_sync = time.monotonic()
+        self.unsynced = False
+        self.lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+        base_offsets = sorted(int(name[:-4]) for name in os.listdir(directory) if name.endswith(".log"))
+        self.segments = [LogSegment(directory, base_offset) for base_offset in base_offsets]
+        if not self.segments:
+            self.segments.append(LogSegment(directory, 0))
+        self.stopped = Event()
+        self.maintainer = None
+        # Interval fsync and retention also run on a timer, so a topic that goes quiet still syncs and ages out
+        if fsync_policy == FsyncPolicy.INTERVAL or retention_bytes is not None or retention_seconds is not None:
+            self.maintainer = Thread(target=self._maintain_periodically, daemon=True)
+            self.maintainer.start()
+
+    def append(self, content):
+        return self.append_batch([content])[0]
+
+    def append_batch(self, contents):
+        timestamp = int(time.time() * 1000)
+        records = [(timestamp, self.serializer(content)) for content in contents]
+        with self.lock:
+            if self.segments[-1].size >= self.segment_bytes:
+                self._roll()
+            segment = self.segments[-1]
+            first_offset = segment.next_offset
+            segment.append(records)
+            self._maybe_sync(segment)
+        return list(range(first_offset, first_offset + len(records)))
+
+    def read(self, from_offset=0):
+        with self.lock:
+            # Bound each segment to what has been written so far; later appends are not visible to this read
+            snapshot = [(segment, segment.size) for segment in self.segments]
+        for index, (segment, end_position) in enumerate(snapshot):
+            next_base = snapshot[index + 1][0].base_offset if index + 1 < len(snapshot) else None
+            if next_base is not None and next_base <= from_offset:
+                continue
+            for offset, timestamp, payload in segment.read(from_offset, end_position):
+                yield offset, timestamp, self.deserializer(payload)
+
+    def get_start_offset(self):
+        return self.segments[0].base_offset
+
+    def get_end_offset(self):
+        return self.segments[-1].next_offset
+
+    def close(self):
+        self.stopped.set()
+        if self.maintainer is not None:
+            self.maintainer.join()
+        with self.lock:
+            for segment in self.segments:
+                if self.fsync_policy != FsyncPolicy.NEVER:
+                    segment.sync()
+                segment.close()
+
+    def _maybe_sync(self, segment):
+        if self.fsync_policy == FsyncPolicy.ALWAYS:
+            segment.sync()
+        elif self.fsync_policy == FsyncPolicy.INTERVAL:
+            self.unsynced = True
+            if time.monotonic() - self.last_sync >= self.fsync_interval:
+                segment.sync()
+                self.last_sync = time.monotonic()
+                self.unsynced = False
+
+    def _maintain_periodically(self):
+        while not self.stopped.wait(self.fsync_interval):
+            with self.lock:
+                if self.unsynced and time.monotonic() - self.last_sync >= self.fsync_interval:
+                    self.segments[-1].sync()
+                    self.last_sync = time.monotonic()
+                    self.unsynced = False
+                self._apply_retention()
+
+    def _roll(self):
+        active = self.segments[-1]
+        if self.fsync_policy != FsyncPolicy.NEVER:
+            active.sync()
+        self.segments.append(LogSegment(self.directory, active.next_offset))
+        self._apply_retention()
+
+    def _apply_retention(self):
+        now = time.time()
+        # The active segment is never deleted
+        while len(self.segments) > 1:
+            oldest = self.segments[0]
+            total_bytes = sum(segment.size for segment in self.segments)
+            too_big = self.retention_bytes is not None and total_bytes > self.retention_bytes
+            too_old = self.retention_seconds is not None and now - oldest.last_modified() > self.retention_seconds
+            if not (too_big or too_old):
+                break
+            oldest.delete()
+            self.segments.pop(0)
+
+# durable_log_benchmark.py
+import tempfile
+import time
+from durable_log import DurableLog
+from fsync_policy import FsyncPolicy
+
+class DurableLogBenchmark:
+    NUM_MESSAGES = 200000
+    BATCH_SIZE = 100
+
+    @staticmethod
+    def run():
+        contents = [{"order_id": i, "status": "created"} for i in range(DurableLogBenchmark.NUM_MESSAGES)]
+        for fsync_policy in FsyncPolicy:
+            with tempfile.TemporaryDirectory() as directory:
+                log = DurableLog(directory, segment_bytes=16 * 1024 * 1024, fsync_policy=fsync_policy)
+                start = time.perf_counter()
+                for i in range(0, len(contents), DurableLogBenchmark.BATCH_SIZE):
+                    log.append_batch(contents[i:i + DurableLogBenchmark.BATCH_SIZE])
+                append_rate = len(contents) / (time.perf_counter() - start)
+                start = time.perf_counter()
+                replayed = sum(1 for _ in log.read(0))
+                replay_rate = replayed / (time.perf_counter() - start)
+                log.close()
+                print(f"fsync {fsync_policy.name:>8}: append {append_rate:>10,.0f} msg/s "
+                      f"(batches of {DurableLogBenchmark.BATCH_SIZE}), replay {replay_rate:>10,.0f} msg/s")
+
+if __name__ == "__main__":
+    DurableLogBenchmark.run()
+
+# fsync_policy.py
+from enum import Enum
+
+class FsyncPolicy(Enum):
+    ALWAYS = 1
+    INTERVAL = 2
+    NEVER = 3
+
+# group_delivery.py
+class GroupDelivery:
+    # One message as handed to a consumer group; the partition is kept here because the same Message
+    # may be published to several partitioned topics
+    def __init__(self, partition, message):
+        self.partition = partition
+        self.message = message
+        self.published_at = message.published_at
+
+    def get_partition(self):
+        return self.partition
+
+    def get_message(self):
+        return self.message
+
+# group_member.py
+class GroupMember:
+    # Wraps a consumer-group subscriber so the group learns when each partition's messages are done with
+    def __init__(self, group, subscriber):
+        self.group = group
+        self.subscriber = subscriber
+
+    def on_message(self, delivery):
+        try:
+            self.subscriber.on_message(delivery.message)
+        finally:
+            self.group.acknowledge([delivery])
+
+    def on_dropped(self, delivery):
+        self.group.acknowledge([delivery])
+
+class BatchGroupMember(GroupMember):
+    def on_messages(self, deliveries):
+        try:
+            self.subscriber.on_messages([delivery.message for delivery in deliveries])
+        finally:
+            self.group.acknowledge(deliveries)
+
+# latency_histogram.py
+class LatencyHistogram:
+    # Nanosecond latencies fit in 63 bits, so bit_length() is always a valid bucket index
+    NUM_BUCKETS = 64
+
+    def __init__(self):
+        # Bucket i counts samples in [2 ** (i - 1), 2 ** i) nanoseconds
+        self.buckets = [0] * self.NUM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, latency_ns, count=1):
+        self.buckets[latency_ns.bit_length()] += count
+        self.count += count
+        self.total_ns += latency_ns * count
+        if latency_ns > self.max_ns:
+            self.max_ns = latency_ns
+
+    def merge(self, other):
+        for i, bucket_count in enumerate(other.buckets):
+            self.buckets[i] += bucket_count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, percent):
+        if self.count == 0:
+            return 0
+        threshold = self.count * percent / 100
+        seen = 0
+        for i, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= threshold:
+                return min(1 << i, self.max_ns)
+        return self.max_ns
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ns": self.total_ns / self.count if self.count else 0,
+            "p50_ns": self.percentile(50),
+            "p90_ns": self.percentile(90),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max_ns,
+        }
+
+# log_segment.py
+import bisect
+import mmap
+import os
+import struct
+
+class LogSegment:
+    # offset, timestamp in ms, payload length, then the payload bytes
+    RECORD_HEADER = struct.Struct("<qqI")
+    INDEX_ENTRY = struct.Struct("<qQ")
+
+    def __init__(self, directory, base_offset, index_interval_bytes=4096):
+        self.base_offset = base_offset
+        self.index_interval_bytes = index_interval_bytes
+        self.log_path = os.path.join(directory, f"{base_offset:020d}.log")
+        self.index_path = os.path.join(directory, f"{base_offset:020d}.index")
+        self.index_offsets = []
+        self.index_positions = []
+        self.next_offset = base_offset
+        self.size = 0
+        self.bytes_since_index = 0
+        self._recover()
+        self.log_file = open(self.log_path, "ab", buffering=0)
+        self.index_file = open(self.index_path, "ab", buffering=0)
+
+    def append(self, records):
+        chunks = []
+        index_entries = []
+        position = self.size
+        for timestamp, payload in records:
+            if not self.index_offsets or self.bytes_since_index >= self.index_interval_bytes:
+                index_entries.append((self.next_offset, position))
+                self.bytes_since_index = 0
+            record = self.RECORD_HEADER.pack(self.next_offset, timestamp, len(payload)) + payload
+            chunks.append(record)
+            position += len(record)
+            self.bytes_since_index += len(record)
+            self.next_offset += 1
+        self.log_file.write(b"".join(chunks))
+        self.size = position
+        for offset, entry_position in index_entries:
+            self.index_offsets.append(offset)
+            self.index_positions.append(entry_position)
+        if index_entries:
+            self.index_file.write(b"".join(self.INDEX_ENTRY.pack(*entry) for entry in index_entries))
+
+    def read(self, from_offset, end_position):
+        if end_position == 0 or from_offset >= self.next_offset:
+            return
+        # Jump to the closest indexed record at or before the requested offset, then scan forward
+        slot = max(0, bisect.bisect_right(self.index_offsets, from_offset) - 1)
+        position = self.index_positions[slot] if self.index_positions else 0
+        header = self.RECORD_HEADER
+        try:
+            file = open(self.log_path, "rb")
+        except FileNotFoundError:
+            # Removed by retention while the reader was catching up
+            return
+        with file, mmap.mmap(file.fileno(), end_position, access=mmap.ACCESS_READ) as buffer:
+            while position + header.size <= end_position:
+                offset, timestamp, length = header.unpack_from(buffer, position)
+                position += header.size
+                if offset >= from_offset:
+                    yield offset, timestamp, buffer[position:position + length]
+                position += length
+
+    def sync(self):
+        os.fsync(self.log_file.fileno())
+        os.fsync(self.index_file.fileno())
+
+    def last_modified(self):
+        return os.path.getmtime(self.log_path)
+
+    def close(self):
+        self.log_file.close()
+        self.index_file.close()
+
+    def delete(self):
+        self.close()
+        os.remove(self.log_path)
+        os.remove(self.index_path)
+
+    def _recover(self):
+        if not os.path.exists(self.log_path):
+            return
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as file:
+                data = file.read()
+            usable = len(data) - len(data) % self.INDEX_ENTRY.size
+            for offset, position in self.INDEX_ENTRY.iter_unpack(data[:usable]):
+                self.index_offsets.append(offset)
+                self.index_positions.append(position)
+        # Scan from the last indexed record to find the end and drop a torn trailing write
+        file_size = os.path.getsize(self.log_path)
+        position = self.index_positions[-1] if self.index_positions else 0
+        next_offset = self.index_offsets[-1] if self.index_offsets else self.base_offset
+        header = self.RECORD_HEADER
+        with open(self.log_path, "rb") as file:
+            file.seek(position)
+            data = file.read()
+        cursor = 0
+        while cursor + header.size <= len(data):
+            offset, _, length = header.unpack_from(data, cursor)
+            if cursor + header.size + length > len(data):
+                break
+            cursor += header.size + length
+            next_offset = offset + 1
+        self.size = position + cursor
+        self.next_offset = next_offset
+        if self.size < file_size:
+            with open(self.log_path, "r+b") as file:
+                file.truncate(self.size)
+        stale_entries = 0
+        while self.index_positions and self.index_positions[-1] >= self.size > 0:
+            self.index_offsets.pop()
+            self.index_positions.pop()
+            stale_entries += 1
+        if stale_entries:
+            with open(self.index_path, "wb") as file:
+                file.write(b"".join(self.INDEX_ENTRY.pack(*entry) for entry in zip(self.index_offsets, self.index_positions)))
+        self.bytes_since_index = self.size - (self.index_positions[-1] if self.index_positions else 0)
+
 # message.py
 class Message:
-    def __init__(self, content):
+    def __init__(self, content, offset=None, key=None):
         self.content = content
+        self.offset = offset
+        self.key = key
+        self.published_at = None
 
     def get_content(self):
         return self.content
 
+    def get_offset(self):
+        return self.offset
+
+    def get_key(self):
+        return self.key
+
+    def get_published_at(self):
+        return self.published_at
+
+# pub_sub_batch_benchmark.py
+import time
+from threading import Event
+from message import Message
+from pub_sub_system import PubSubSystem
+
+class CountingSubscriber:
+    def __init__(self, expected):
+        self.expected = expected
+        self.received = 0
+        self.done = Event()
+
+    def on_message(self, message):
+        self.received += 1
+        if self.received >= self.expected:
+            self.done.set()
+
+class BatchCountingSubscriber(CountingSubscriber):
+    def on_messages(self, messages):
+        self.received += len(messages)
+        if self.received >= self.expected:
+            self.done.set()
+
+class PubSubBatchBenchmark:
+    NUM_MESSAGES = 200000
+    NUM_SUBSCRIBERS = 4
+
+    @staticmethod
+    def measure(batch_size):
+        pub_sub_system = PubSubSystem(queue_capacity=10000, max_batch_size=batch_size, max_linger_time=0.001)
+        pub_sub_system.create_topic("events")
+        subscriber_class = BatchCountingSubscriber if batch_size > 1 else CountingSubscriber
+        subscribers = [subscriber_class(PubSubBatchBenchmark.NUM_MESSAGES) for _ in range(PubSubBatchBenchmark.NUM_SUBSCRIBERS)]
+        for subscriber in subscribers:
+            pub_sub_system.subscribe("events", subscriber)
+        messages = [Message(i) for i in range(PubSubBatchBenchmark.NUM_MESSAGES)]
+        start = time.perf_counter()
+        if batch_size > 1:
+            for i in range(0, len(messages), batch_size):
+                pub_sub_system.publish_batch("events", messages[i:i + batch_size])
+        else:
+            for message in messages:
+                pub_sub_system.publish("events", message)
+        for subscriber in subscribers:
+            subscriber.done.wait()
+        elapsed = time.perf_counter() - start
+        pub_sub_system.shutdown()
+        return PubSubBatchBenchmark.NUM_MESSAGES / elapsed
+
+    @staticmethod
+    def run():
+        print(f"{PubSubBatchBenchmark.NUM_SUBSCRIBERS} subscribers, {PubSubBatchBenchmark.NUM_MESSAGES:,} messages")
+        for batch_size in (1, 10, 100, 1000):
+            print(f"batch size {batch_size:>5}: {PubSubBatchBenchmark.measure(batch_size):>12,.0f} messages/s")
+
+if __name__ == "__main__":
+    PubSubBatchBenchmark.run()
+
+# pub_sub_load_benchmark.py
+from threading import Event, Lock, Thread
+from message import Message
+from pub_sub_system import PubSubSystem
+
+class LoadSubscriber:
+    def __init__(self, expected, counter):
+        self.expected = expected
+        self.counter = counter
+        self.received = 0
+
+    def on_message(self, message):
+        self.received += 1
+        if self.received == self.expected:
+            self.counter.finish()
+
+class CompletionCounter:
+    def __init__(self, count):
+        self.remaining = count
+        self.lock = Lock()
+        self.done = Event()
+
+    def finish(self):
+        with self.lock:
+            self.remaining -= 1
+            if self.remaining == 0:
+                self.done.set()
+
+class PubSubLoadBenchmark:
+    MESSAGES_PER_PUBLISHER = 20000
+    SCENARIOS = [(1, 1), (1, 8), (4, 4), (8, 8), (8, 32)]
+
+    @staticmethod
+    def measure(num_publishers, num_subscribers):
+        pub_sub_system = PubSubSystem(queue_capacity=10000, record_metrics=True)
+        pub_sub_system.create_topic("load")
+        expected = num_publishers * PubSubLoadBenchmark.MESSAGES_PER_PUBLISHER
+        counter = CompletionCounter(num_subscribers)
+        for _ in range(num_subscribers):
+            pub_sub_system.subscribe("load", LoadSubscriber(expected, counter))
+        topic = pub_sub_system.get_topics()["load"]
+
+        def publish():
+            for i in range(PubSubLoadBenchmark.MESSAGES_PER_PUBLISHER):
+                topic.publish(Message(i))
+
+        # Samples queue depth while the load runs, since it is back to zero once everything is delivered
+        max_queue_depth = 0
+        publishers = [Thread(target=publish) for _ in range(num_publishers)]
+        for publisher in publishers:
+            publisher.start()
+        while not counter.done.wait(0.01):
+            max_queue_depth = max(max_queue_depth, topic.get_queue_depth())
+        for publisher in publishers:
+            publisher.join()
+        metrics = pub_sub_system.get_topic_metrics("load")
+        pub_sub_system.shutdown()
+        return metrics, max_queue_depth
+
+    @staticmethod
+    def run():
+        print(f"{PubSubLoadBenchmark.MESSAGES_PER_PUBLISHER} messages per publisher, one topic, BLOCK backpressure")
+        for num_publishers, num_subscribers in PubSubLoadBenchmark.SCENARIOS:
+            metrics, max_queue_depth = PubSubLoadBenchmark.measure(num_publishers, num_subscribers)
+            latency = metrics["latency"]
+            print(f"{num_publishers:>2} pub x {num_subscribers:>2} sub: "
+                  f"publish {metrics['publish_rate']:>9,.0f} msg/s, "
+                  f"deliver {metrics['delivery_rate']:>9,.0f} msg/s, "
+                  f"max depth {max_queue_depth:>6,}, "
+                  f"latency p50 {latency['p50_ns'] / 1e3:>8,.0f} us, "
+                  f"p99 {latency['p99_ns'] / 1e3:>8,.0f} us, "
+                  f"max {latency['max_ns'] / 1e3:>8,.0f} us")
+
+if __name__ == "__main__":
+    PubSubLoadBenchmark.run()
+
 # pub_sub_system.py
-from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from backpressure_policy import BackpressurePolicy
 from topic import Topic
+from topic_trie import TopicTrie
 
 class PubSubSystem:
-    def __init__(self):
+    def __init__(self, queue_capacity=1000, backpressure_policy=BackpressurePolicy.BLOCK, max_batch_size=1,
+                 max_linger_time=0, record_metrics=False):
         self.topics = {}
-        self.executor_service = ThreadPoolExecutor(max_workers=10)
+        self.queue_capacity = queue_capacity
+        self.backpressure_policy = backpressure_policy
+        self.max_batch_size = max_batch_size
+        self.max_linger_time = max_linger_time
+        self.record_metrics = record_metrics
+        self.pattern_subscriptions = TopicTrie()
+        # (topic name, subscriber, group id) for subscriptions made by exact topic name
+        self.direct_subscriptions = set()
+        self.lock = Lock()
 
-    def create_topic(self, topic_name):
-        self.topics.setdefault(topic_name, Topic(topic_name))
+    def create_topic(self, topic_name, durable_log=None, num_partitions=1):
+        with self.lock:
+            if topic_name in self.topics:
+                return
+            topic = self.topics[topic_name] = Topic(topic_name, durable_log, num_partitions, self.record_metrics)
+            # Pattern subscribers are attached once here, so publishing stays a plain dict lookup
+            for subscriber, options in self.pattern_subscriptions.match(topic_name).items():
+                topic.add_subscriber(subscriber, **options)
 
-    def subscribe(self, topic_name, subscriber):
+    def subscribe(self, topic_name, subscriber, queue_capacity=None, backpressure_policy=None, max_batch_size=None,
+                  max_linger_time=None, from_offset=None, group_id=None):
+        options = {
+            "capacity": queue_capacity or self.queue_capacity,
+            "policy": backpressure_policy or self.backpressure_policy,
+            "max_batch_size": max_batch_size or self.max_batch_size,
+            "max_linger_time": self.max_linger_time if max_linger_time is None else max_linger_time,
+            "group_id": group_id,
+        }
+        if TopicTrie.is_pattern(topic_name):
+            with self.lock:
+                self.pattern_subscriptions.insert(topic_name, subscriber, options)
+                topics = self._topics_matching(topic_name)
+            for topic in topics:
+                topic.add_subscriber(subscriber, **options)
+            return
+        with self.lock:
+            topic = self.topics.get(topic_name)
+            if topic is None:
+                return
+            self.direct_subscriptions.add((topic_name, subscriber, group_id))
+        topic.add_subscriber(subscriber, from_offset, **options)
+
+    def unsubscribe(self, topic_name, subscriber, group_id=None):
+        # A topic keeps the subscription while another pattern or a direct subscription still reaches it
+        if TopicTrie.is_pattern(topic_name):
+            with self.lock:
+                self.pattern_subscriptions.remove(topic_name, subscriber)
+                topics = [topic for topic in self._topics_matching(topic_name)
+                          if not self._is_subscribed(topic.get_name(), subscriber, group_id)]
+            for topic in topics:
+                topic.remove_subscriber(subscriber, group_id)
+            return
+        with self.lock:
+            self.direct_subscriptions.discard((topic_name, subscriber, group_id))
+            topic = self.topics.get(topic_name)
+            if topic is None or self._is_subscribed(topic_name, subscriber, group_id):
+                return
+        topic.remove_subscriber(subscriber, group_id)
+
+    def publish(self, topic_name, message):
         topic = self.topics.get(topic_name)
         if topic:
-            topic.add_subscriber(subscriber)
+            topic.publish(message)
 
-    def unsubscribe(self, topic_name, subscriber):
+    def publish_batch(self, topic_name, messages):
         topic = self.topics.get(topic_name)
         if topic:
-            topic.remove_subscriber(subscriber)
+            topic.publish_batch(messages)
 
-    def publish(self, topic_name, message):
+    def replay(self, topic_name, from_offset=0):
         topic = self.topics.get(topic_name)
-        if topic:
-            self.executor_service.submit(topic.publish, message)
+        return topic.replay(from_offset) if topic else iter(())
+
+    def get_subscriber_metrics(self, topic_name):
+        topic = self.topics.get(topic_name)
+        return topic.get_subscriber_metrics() if topic else {}
+
+    def get_group_metrics(self, topic_name):
+        topic = self.topics.get(topic_name)
+        return topic.get_group_metrics() if topic else {}
+
+    def get_topic_metrics(self, topic_name=None):
+        if topic_name is not None:
+            topic = self.topics.get(topic_name)
+            return topic.get_metrics() if topic else {}
+        return {name: topic.get_metrics() for name, topic in list(self.topics.items())}
+
+    def reset_topic_metrics(self):
+        for topic in list(self.topics.values()):
+            topic.reset_metrics()
 
     def shutdown(self):
-        self.executor_service.shutdown()
+        for topic in self.topics.values():
+            topic.close()
 
     def get_topics(self):
         return self.topics
 
+    def _is_subscribed(self, topic_name, subscriber, group_id):
+        if (topic_name, subscriber, group_id) in self.direct_subscriptions:
+            return True
+        options = self.pattern_subscriptions.match(topic_name).get(subscriber)
+        return options is not None and options["group_id"] == group_id
+
+    def _topics_matching(self, pattern):
+        pattern_trie = TopicTrie()
+        pattern_trie.insert(pattern, pattern, None)
+        return [topic for name, topic in self.topics.items() if pattern_trie.match(name)]
+
 # pub_sub_system_demo.py
 from concrete_subscriber import ConcreteSubscriber
 from message import Message
@@ -89,6 +1163,14 @@ class PubSubSystemDemo:
         publisher1.publish(Message("Message3 for Topic1"))
         publisher2.publish(Message("Message2 for Topic2"))
 
+        # Share a partitioned topic between the members of a consumer group
+        pub_sub_system.create_topic("Orders", num_partitions=4)
+        pub_sub_system.subscribe("Orders", ConcreteSubscriber("Worker1"), group_id="billing")
+        pub_sub_system.subscribe("Orders", ConcreteSubscriber("Worker2"), group_id="billing")
+        publisher3 = Publisher(pub_sub_system.get_topics().get("Orders"))
+        for i, customer in enumerate(["alice", "bob", "alice", "bob"]):
+            publisher3.publish(Message(f"Order{i} for {customer}", key=customer))
+
         # Shutdown the system
         pub_sub_system.shutdown()
 
@@ -103,27 +1185,398 @@ class Publisher:
     def publish(self, message):
         self.topic.publish(message)
 
+    def publish_batch(self, messages):
+        self.topic.publish_batch(messages)
+
 # subscriber.py
 class Subscriber:
     def on_message(self, message):
         pass
 
+# subscription.py
+import time
+from collections import deque
+from threading import Condition, Thread
+from backpressure_policy import BackpressurePolicy
+
+class Subscription:
+    def __init__(self, subscriber, capacity=1000, policy=BackpressurePolicy.BLOCK, max_batch_size=1,
+                 max_linger_time=0, metrics=None):
+        self.subscriber = subscriber
+        self.capacity = capacity
+        self.policy = policy
+        self.max_batch_size = max_batch_size
+        self.max_linger_time = max_linger_time
+        self.metrics = metrics
+        # Subscribers opt into batched delivery by implementing on_messages
+        self.batch_handler = getattr(subscriber, "on_messages", None)
+        self.drop_handler = getattr(subscriber, "on_dropped", None)
+        self.queue = deque()
+        self.condition = Condition()
+        self.enqueued_count = 0
+        self.delivered_count = 0
+        self.dropped_count = 0
+        self.closed = False
+        self.dispatcher = Thread(target=self._dispatch, daemon=True)
+        self.dispatcher.start()
+
+    def enqueue(self, message):
+        evicted = []
+        with self.condition:
+            accepted = self._enqueue(message, evicted)
+            self.condition.notify_all()
+        self._report_evicted(evicted)
+        return accepted
+
+    def enqueue_batch(self, messages, block=True):
+        evicted = []
+        with self.condition:
+            accepted = 0
+            for message in messages:
+                accepted += self._enqueue(message, evicted, block)
+            self.condition.notify_all()
+        self._report_evicted(evicted)
+        return accepted
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.dispatcher.join()
+
+    def get_lag(self):
+        return len(self.queue)
+
+    def get_metrics(self):
+        with self.condition:
+            return {
+                "lag": len(self.queue),
+                "enqueued": self.enqueued_count,
+                "delivered": self.delivered_count,
+                "dropped": self.dropped_count,
+            }
+
+    def _report_evicted(self, evicted):
+        # Called outside the condition so the handler may take its own locks
+        if self.drop_handler is not None:
+            for message in evicted:
+                self.drop_handler(message)
+
+    def _enqueue(self, message, evicted, block=True):
+        if self.closed:
+            return False
+        if len(self.queue) >= self.capacity:
+            if self.policy == BackpressurePolicy.DROP_NEWEST:
+                self.dropped_count += 1
+                return False
+            if self.policy == BackpressurePolicy.DROP_OLDEST:
+                evicted.append(self.queue.popleft())
+                self.dropped_count += 1
+            elif block:
+                # Lets the dispatcher drain what is already queued while we wait; without block the message
+                # is taken past capacity instead
+                self.condition.notify_all()
+                while len(self.queue) >= self.capacity and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return False
+        self.queue.append(message)
+        self.enqueued_count += 1
+        return True
+
+    def _next_batch(self):
+        with self.condition:
+            while not self.queue and not self.closed:
+                self.condition.wait()
+            if self.max_linger_time and len(self.queue) < self.max_batch_size and not self.closed:
+                deadline = time.monotonic() + self.max_linger_time
+                while len(self.queue) < self.max_batch_size and not self.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+            batch = [self.queue.popleft() for _ in range(min(self.max_batch_size, len(self.queue)))]
+            # Wakes a publisher blocked on a full queue
+            self.condition.notify_all()
+            return batch
+
+    def _dispatch(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            try:
+                if self.batch_handler is not None:
+                    if self.metrics is not None:
+                        self.metrics.record_delivery(batch, time.monotonic_ns())
+                    self.batch_handler(batch)
+                else:
+                    for message in batch:
+                        # Stamped per message so time spent handling earlier messages in the batch counts as latency
+                        if self.metrics is not None:
+                            self.metrics.record_delivery([message], time.monotonic_ns())
+                        self.subscriber.on_message(message)
+            except Exception as e:
+                print(f"Error delivering message: {e}")
+            with self.condition:
+                self.delivered_count += len(batch)
+
 # topic.py
+import itertools
+import time
+import zlib
+from threading import Lock
+from consumer_group import ConsumerGroup
+from message import Message
+from subscription import Subscription
+from topic_metrics import TopicMetrics
+
 class Topic:
-    def __init__(self, name):
+    def __init__(self, name, log=None, num_partitions=1, record_metrics=False):
         self.name = name
-        self.subscribers = set()
+        self.log = log
+        self.num_partitions = num_partitions
+        self.subscriptions = {}
+        self.consumer_groups = {}
+        self.round_robin = itertools.count()
+        self.metrics = TopicMetrics() if record_metrics else None
+        self.lock = Lock()
 
     def get_name(self):
         return self.name
 
-    def add_subscriber(self, subscriber):
-        self.subscribers.add(subscriber)
+    def add_subscriber(self, subscriber, from_offset=None, group_id=None, **options):
+        with self.lock:
+            if group_id is not None:
+                group = self.consumer_groups.get(group_id)
+                if group is None:
+                    group = self.consumer_groups[group_id] = ConsumerGroup(group_id, self.num_partitions,
+                                                                           metrics=self.metrics, **options)
+                group.add_member(subscriber)
+                return
+            if subscriber in self.subscriptions:
+                return
+            subscription = Subscription(subscriber, metrics=self.metrics, **options)
+            # Publishers wait on the topic lock, so the replayed backlog and live messages neither overlap nor gap
+            if from_offset is not None and self.log is not None:
+                for message in self.replay(from_offset):
+                    subscription.enqueue(message)
+            self.subscriptions[subscriber] = subscription
 
-    def remove_subscriber(self, subscriber):
-        self.subscribers.discard(subscriber)
+    def remove_subscriber(self, subscriber, group_id=None):
+        if group_id is not None:
+            group = self.consumer_groups.get(group_id)
+            if group:
+                group.remove_member(subscriber)
+            return
+        with self.lock:
+            subscription = self.subscriptions.pop(subscriber, None)
+        if subscription:
+            # Messages published before unsubscribing are still delivered
+            subscription.close()
+
+    def partition_for(self, message):
+        key = message.get_key()
+        if key is None:
+            return next(self.round_robin) % self.num_partitions
+        return zlib.crc32(str(key).encode("utf-8")) % self.num_partitions
 
     def publish(self, message):
-        for subscriber in self.subscribers:
-            subscriber.on_message(message)
+        if self.metrics is not None:
+            message.published_at = time.monotonic_ns()
+            self.metrics.record_publish()
+        if self.log is not None:
+            with self.lock:
+                message.offset = self.log.append(message.get_content())
+                self._deliver(message)
+            return
+        self._deliver(message)
+
+    def publish_batch(self, messages):
+        if self.metrics is not None:
+            published_at = time.monotonic_ns()
+            for message in messages:
+                message.published_at = published_at
+            self.metrics.record_publish(len(messages))
+        if self.log is not None:
+            with self.lock:
+                offsets = self.log.append_batch([message.get_content() for message in messages])
+                for message, offset in zip(messages, offsets):
+                    message.offset = offset
+                self._deliver_batch(messages)
+            return
+        self._deliver_batch(messages)
+
+    def replay(self, from_offset=0):
+        if self.log is None:
+            return
+        for offset, _, content in self.log.read(from_offset):
+            yield Message(content, offset)
+
+    def get_subscriber_metrics(self):
+        return {subscriber: subscription.get_metrics() for subscriber, subscription in list(self.subscriptions.items())}
+
+    def get_group_metrics(self):
+        return {group_id: group.get_metrics() for group_id, group in list(self.consumer_groups.items())}
+
+    def get_queue_depth(self):
+        depth = sum(subscription.get_lag() for subscription in list(self.subscriptions.values()))
+        return depth + sum(group.get_lag() for group in list(self.consumer_groups.values()))
+
+    def get_metrics(self):
+        if self.metrics is None:
+            return None
+        return self.metrics.snapshot(self.get_queue_depth())
+
+    def reset_metrics(self):
+        if self.metrics is not None:
+            self.metrics.reset()
+
+    def close(self):
+        with self.lock:
+            subscriptions = list(self.subscriptions.values())
+            self.subscriptions.clear()
+            groups = list(self.consumer_groups.values())
+            self.consumer_groups.clear()
+        for subscription in subscriptions:
+            subscription.close()
+        for group in groups:
+            group.close()
+        if self.log is not None:
+            self.log.close()
+
+    def _deliver(self, message):
+        for subscription in list(self.subscriptions.values()):
+            subscription.enqueue(message)
+        if self.consumer_groups:
+            partition = self.partition_for(message)
+            for group in list(self.consumer_groups.values()):
+                group.enqueue(partition, message)
+
+    def _deliver_batch(self, messages):
+        for subscription in list(self.subscriptions.values()):
+            subscription.enqueue_batch(messages)
+        if self.consumer_groups:
+            by_partition = {}
+            for message in messages:
+                by_partition.setdefault(self.partition_for(message), []).append(message)
+            for group in list(self.consumer_groups.values()):
+                for partition, partition_messages in by_partition.items():
+                    group.enqueue_batch(partition, partition_messages)
+
+# topic_metrics.py
+import time
+from threading import Lock
+from latency_histogram import LatencyHistogram
+
+class TopicMetrics:
+    def __init__(self):
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.published_count = 0
+            self.delivered_count = 0
+            self.latency = LatencyHistogram()
+            self.started_at = time.monotonic_ns()
+
+    def record_publish(self, count=1):
+        with self.lock:
+            self.published_count += count
+
+    def record_delivery(self, messages, delivered_at):
+        # Called once per batch handed to on_messages, or once per message otherwise;
+        # messages published together share a timestamp, so runs of equal timestamps are recorded as a single weighted sample
+        with self.lock:
+            self.delivered_count += len(messages)
+            run_start = None
+            run_length = 0
+            for message in messages:
+                if message.published_at != run_start:
+                    if run_start is not None:
+                        self.latency.record(max(delivered_at - run_start, 0), run_length)
+                    run_start = message.published_at
+                    run_length = 0
+                run_length += 1
+            if run_start is not None:
+                self.latency.record(max(delivered_at - run_start, 0), run_length)
+
+    def snapshot(self, queue_depth):
+        with self.lock:
+            elapsed = max((time.monotonic_ns() - self.started_at) / 1e9, 1e-9)
+            return {
+                "published": self.published_count,
+                "delivered": self.delivered_count,
+                "publish_rate": self.published_count / elapsed,
+                "delivery_rate": self.delivered_count / elapsed,
+                "queue_depth": queue_depth,
+                "latency": self.latency.snapshot(),
+            }
+
+# topic_trie.py
+class TopicTrieNode:
+    def __init__(self):
+        self.children = {}
+        self.subscribers = {}
+
+class TopicTrie:
+    SEPARATOR = "."
+    SINGLE_LEVEL = "*"
+    MULTI_LEVEL = "#"
+
+    def __init__(self):
+        self.root = TopicTrieNode()
+
+    @staticmethod
+    def is_pattern(topic_name):
+        return any(segment in (TopicTrie.SINGLE_LEVEL, TopicTrie.MULTI_LEVEL)
+                   for segment in topic_name.split(TopicTrie.SEPARATOR))
+
+    def insert(self, pattern, subscriber, options):
+        node = self.root
+        for segment in pattern.split(self.SEPARATOR):
+            node = node.children.setdefault(segment, TopicTrieNode())
+        node.subscribers[subscriber] = options
+
+    def remove(self, pattern, subscriber):
+        path = [self.root]
+        segments = pattern.split(self.SEPARATOR)
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].subscribers.pop(subscriber, None)
+        # Prune branches that no longer lead to any subscription
+        for depth in range(len(segments), 0, -1):
+            node = path[depth]
+            if node.subscribers or node.children:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+
+    def match(self, topic_name):
+        segments = topic_name.split(self.SEPARATOR)
+        matched = {}
+        stack = [(self.root, 0)]
+        visited = set()
+        # Each (node, position) pair is expanded once, so the walk is bounded by topic depth
+        while stack:
+            node, position = stack.pop()
+            if (id(node), position) in visited:
+                continue
+            visited.add((id(node), position))
+            multi_level = node.children.get(self.MULTI_LEVEL)
+            if multi_level is not None:
+                # '#' swallows zero or more of the remaining segments
+                for end in range(position, len(segments) + 1):
+                    stack.append((multi_level, end))
+            if position == len(segments):
+                matched.update(node.subscribers)
+                continue
+            for key in (segments[position], self.SINGLE_LEVEL):
+                child = node.children.get(key)
+                if child is not None:
+                    stack.append((child, position + 1))
+        return matched
 
@@ -22,11 +22,125 @@ class Signal(Enum):
     YELLOW = 2
     GREEN = 3
 
+# signal_scheduler.py
+import heapq
+import itertools
+import threading
+import time
+
+class SignalScheduler:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        # (due time, sequence, light); an entry is live only while its sequence matches tokens[light]
+        self.heap = []
+        self.tokens = {}
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.transitions = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+
+    def schedule(self, traffic_light, delay_ms: int):
+        with self.condition:
+            sequence = next(self.sequence)
+            self.tokens[traffic_light] = sequence
+            due = self.clock() + delay_ms / 1000
+            heapq.heappush(self.heap, (due, sequence, traffic_light))
+            # Wakes the scheduler thread in case this transition is now the earliest
+            if self.heap[0][1] == sequence:
+                self.condition.notify()
+
+    def cancel(self, traffic_light):
+        with self.condition:
+            self.tokens.pop(traffic_light, None)
+
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def advance(self, seconds):
+        # Fast-forwards a SimulatedClock, firing every transition that falls due on the way in order
+        with self.condition:
+            until = self.clock() + seconds
+            while self.heap and self.heap[0][0] <= until:
+                self.clock.set(self.heap[0][0])
+                self._fire_next(self.heap[0][0])
+            self.clock.set(until)
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                "scheduled": len(self.tokens),
+                "transitions": self.transitions,
+                "mean_lateness": self.total_lateness / self.transitions if self.transitions else 0.0,
+                "max_lateness": self.max_lateness,
+            }
+
+    def _run(self):
+        with self.condition:
+            while self.running:
+                if not self.heap:
+                    self.condition.wait()
+                    continue
+                now = self.clock()
+                delay = self.heap[0][0] - now
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                while self.heap and self.heap[0][0] <= now:
+                    self._fire_next(now)
+
+    def _fire_next(self, now):
+        due, sequence, traffic_light = heapq.heappop(self.heap)
+        if self.tokens.get(traffic_light) != sequence:
+            return
+        try:
+            duration = traffic_light.advance()
+        except Exception as e:
+            print(f"Error in traffic light control: {e}")
+            self.tokens.pop(traffic_light, None)
+            return
+        lateness = now - due
+        self.transitions += 1
+        self.total_lateness += lateness
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+        # Each light keeps exactly one entry in the heap: its next phase change
+        next_sequence = next(self.sequence)
+        self.tokens[traffic_light] = next_sequence
+        heapq.heappush(self.heap, (due + duration / 1000, next_sequence, traffic_light))
+
+# simulated_clock.py
+class SimulatedClock:
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def set(self, now):
+        self.now = now
+
 # traffic_controller.py
 import threading
 import time
 from signal import Signal
 from road import Road
+from signal_scheduler import SignalScheduler
 from traffic_light import TrafficLight
 
 class TrafficController:
@@ -38,6 +152,7 @@ class TrafficController:
             if cls._instance is None:
                 cls._instance = super().__new__(cls)
                 cls._instance.roads = {}
+                cls._instance.scheduler = None
         return cls._instance
 
     @classmethod
@@ -46,40 +161,53 @@ class TrafficController:
 
     def add_road(self, road: Road):
         self.roads[road.id] = road
+        if self.scheduler:
+            self._start_light(road.get_traffic_light())
 
     def remove_road(self, road_id: str):
-        self.roads.pop(road_id, None)
+        road = self.roads.pop(road_id, None)
+        if road and self.scheduler:
+            self.scheduler.cancel(road.get_traffic_light())
 
-    def start_traffic_control(self):
+    def start_traffic_control(self, clock=None):
+        # One scheduler drives every light; with a SimulatedClock, time only moves through advance_time
+        if self.scheduler:
+            return
+        self.scheduler = SignalScheduler(clock or time.monotonic)
         for road in self.roads.values():
-            traffic_light = road.get_traffic_light()
-            threading.Thread(target=self._control_traffic_light, args=(traffic_light,), daemon=True).start()
-
-    def _control_traffic_light(self, traffic_light: TrafficLight):
-        while True:
-            try:
-                time.sleep(traffic_light.red_duration / 1000)  # Convert to seconds
-                traffic_light.change_signal(Signal.GREEN)
-                time.sleep(traffic_light.green_duration / 1000)
-                traffic_light.change_signal(Signal.YELLOW)
-                time.sleep(traffic_light.yellow_duration / 1000)
-                traffic_light.change_signal(Signal.RED)
-            except Exception as e:
-                print(f"Error in traffic light control: {e}")
+            self._start_light(road.get_traffic_light())
+        if clock is None:
+            self.scheduler.start()
+
+    def stop_traffic_control(self):
+        if self.scheduler:
+            self.scheduler.stop()
+            self.scheduler = None
+
+    def advance_time(self, seconds):
+        self.scheduler.advance(seconds)
 
     def handle_emergency(self, road_id: str):
         road = self.roads.get(road_id)
         if road:
             traffic_light = road.get_traffic_light()
             traffic_light.change_signal(Signal.GREEN)
+            # The light's pending transition is replaced so the green phase lasts its full duration
+            if self.scheduler:
+                self.scheduler.schedule(traffic_light, traffic_light.green_duration)
             # Perform emergency handling logic
             # ...
 
+    def _start_light(self, traffic_light: TrafficLight):
+        self.scheduler.schedule(traffic_light, traffic_light.get_duration(traffic_light.get_current_signal()))
+
 # traffic_light.py
 from signal import Signal
 from threading import Lock
 
 class TrafficLight:
+    NEXT_SIGNAL = {Signal.RED: Signal.GREEN, Signal.GREEN: Signal.YELLOW, Signal.YELLOW: Signal.RED}
+
     def __init__(self, id: str, red_duration: int, yellow_duration: int, green_duration: int):
         self.id = id
         self.current_signal = Signal.RED
@@ -96,10 +224,121 @@ class TrafficLight:
     def get_current_signal(self):
         return self.current_signal
 
+    def get_duration(self, signal: Signal) -> int:
+        if signal == Signal.GREEN:
+            return self.green_duration
+        if signal == Signal.YELLOW:
+            return self.yellow_duration
+        return self.red_duration
+
+    def advance(self) -> int:
+        # Moves to the next phase of the red, green, yellow cycle and returns how long it lasts
+        with self.lock:
+            self.current_signal = self.NEXT_SIGNAL[self.current_signal]
+            self.notify_observers()
+            return self.get_duration(self.current_signal)
+
     def notify_observers(self):
         # Notify observers (e.g., roads) about the signal change
         pass
 
+# traffic_scheduler_benchmark.py
+import random
+import threading
+import time
+import tracemalloc
+from signal_scheduler import SignalScheduler
+from simulated_clock import SimulatedClock
+from traffic_light import TrafficLight
+
+class TrafficSchedulerBenchmark:
+    NUM_LIGHTS = 10000
+    SIMULATED_SECONDS = 3600
+    REAL_TIME_SECONDS = 5
+    LEGACY_LIGHTS = 1000
+
+    @staticmethod
+    def create_lights(count, scale_ms, seed=1):
+        rng = random.Random(seed)
+        return [TrafficLight(f"TL{i}", rng.randint(20, 60) * scale_ms, rng.randint(3, 5) * scale_ms,
+                             rng.randint(20, 60) * scale_ms) for i in range(count)]
+
+    @staticmethod
+    def simulated():
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        lights = TrafficSchedulerBenchmark.create_lights(TrafficSchedulerBenchmark.NUM_LIGHTS, 1000)
+        scheduler = SignalScheduler(SimulatedClock())
+        for light in lights:
+            scheduler.schedule(light, light.red_duration)
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        start = time.process_time()
+        scheduler.advance(TrafficSchedulerBenchmark.SIMULATED_SECONDS)
+        cpu = time.process_time() - start
+        transitions = scheduler.get_stats()["transitions"]
+        print(f"simulated: {TrafficSchedulerBenchmark.NUM_LIGHTS:,} lights, {TrafficSchedulerBenchmark.SIMULATED_SECONDS} s "
+              f"fast-forwarded in {cpu:.2f} s CPU, {transitions:,} transitions ({transitions / cpu:,.0f}/s), "
+              f"{memory / 2 ** 20:.1f} MiB ({memory / TrafficSchedulerBenchmark.NUM_LIGHTS:.0f} B per light incl. light)")
+
+    @staticmethod
+    def real_time():
+        # Phases of 60-180 ms keep every light changing several times a second
+        lights = TrafficSchedulerBenchmark.create_lights(TrafficSchedulerBenchmark.NUM_LIGHTS, 3)
+        scheduler = SignalScheduler()
+        threads_before = threading.active_count()
+        for light in lights:
+            scheduler.schedule(light, light.red_duration)
+        scheduler.start()
+        threads = threading.active_count() - threads_before
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        time.sleep(TrafficSchedulerBenchmark.REAL_TIME_SECONDS)
+        cpu = time.process_time() - start_cpu
+        wall = time.perf_counter() - start_wall
+        scheduler.stop()
+        stats = scheduler.get_stats()
+        print(f"real time: {TrafficSchedulerBenchmark.NUM_LIGHTS:,} lights on {threads} thread, "
+              f"{stats['transitions'] / wall:,.0f} transitions/s, CPU {cpu / wall:.0%} of one core, "
+              f"lateness mean {stats['mean_lateness'] * 1e3:.2f} ms max {stats['max_lateness'] * 1e3:.1f} ms")
+
+    @staticmethod
+    def thread_per_light():
+        # The previous design, for comparison: one sleeping thread per light
+        lights = TrafficSchedulerBenchmark.create_lights(TrafficSchedulerBenchmark.LEGACY_LIGHTS, 3)
+        stopped = threading.Event()
+        transitions = [0]
+
+        def control(light):
+            while not stopped.is_set():
+                time.sleep(light.get_duration(light.get_current_signal()) / 1000)
+                light.advance()
+                transitions[0] += 1
+
+        threads_before = threading.active_count()
+        threads = [threading.Thread(target=control, args=(light,), daemon=True) for light in lights]
+        for thread in threads:
+            thread.start()
+        started = threading.active_count() - threads_before
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        time.sleep(TrafficSchedulerBenchmark.REAL_TIME_SECONDS)
+        cpu = time.process_time() - start_cpu
+        wall = time.perf_counter() - start_wall
+        stopped.set()
+        for thread in threads:
+            thread.join()
+        print(f"thread per light: {TrafficSchedulerBenchmark.LEGACY_LIGHTS:,} lights on {started:,} threads, "
+              f"{transitions[0] / wall:,.0f} transitions/s, CPU {cpu / wall:.0%} of one core")
+
+    @staticmethod
+    def run():
+        TrafficSchedulerBenchmark.simulated()
+        TrafficSchedulerBenchmark.real_time()
+        TrafficSchedulerBenchmark.thread_per_light()
+
+if __name__ == "__main__":
+    TrafficSchedulerBenchmark.run()
+
 # traffic_signal_system_demo.py
 from traffic_controller import TrafficController
 from road import Road